@@ -3,10 +3,47 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+
 DATABASE_URL = os.getenv('DATABASE_URL')
+ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL')
+DATABASE_ASYNC = os.getenv('DATABASE_ASYNC', 'true').lower() == 'true'
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+REPLICA_READ_YOUR_WRITES_SECONDS = float(os.getenv('REPLICA_READ_YOUR_WRITES_SECONDS', 5))
+REPLICA_RETRY_AFTER = float(os.getenv('REPLICA_RETRY_AFTER', 30))
+REPLICA_CONNECT_TIMEOUT = int(os.getenv('REPLICA_CONNECT_TIMEOUT', 2))
+DB_SCHEMA_CHECK = os.getenv('DB_SCHEMA_CHECK', 'true').lower() == 'true'
+DB_MIGRATE_ON_STARTUP = os.getenv('DB_MIGRATE_ON_STARTUP', 'false').lower() == 'true'
+
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
 
 SECRET_KEY = os.getenv('SECRET_KEY')
 REFRESH_SECRET_KEY = os.getenv('REFRESH_SECRET_KEY')
-ALGORITHM = os.getenv('ALGORITHM')
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES'))
-REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv('REFRESH_TOKEN_EXPIRE_DAYS'))
\ No newline at end of file
+ALGORITHM = os.getenv('ALGORITHM', 'HS256')
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', 30))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv('REFRESH_TOKEN_EXPIRE_DAYS', 7))
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+PASSWORD_WORKERS = int(os.getenv('PASSWORD_WORKERS', 2))
+PASSWORD_QUEUE_LIMIT = int(os.getenv('PASSWORD_QUEUE_LIMIT', 32))
+PASSWORD_RETRY_AFTER = int(os.getenv('PASSWORD_RETRY_AFTER', 1))
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+CACHE_TTL = float(os.getenv('CACHE_TTL', 60))
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+SEARCH_INDEX_TTL = float(os.getenv('SEARCH_INDEX_TTL', 300))
+SEARCH_INDEX_MAX_INSTRUCTORS = int(os.getenv('SEARCH_INDEX_MAX_INSTRUCTORS', 1000))
+SEARCH_SIMILARITY = float(os.getenv('SEARCH_SIMILARITY', 0.3))
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_RESULT_TTL = float(os.getenv('JOB_RESULT_TTL', 600))
+JOB_TIMEOUT = float(os.getenv('JOB_TIMEOUT', 600))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 5))
+JOB_REQUEUE_GRACE = float(os.getenv('JOB_REQUEUE_GRACE', 60))
\ No newline at end of file
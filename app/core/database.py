@@ -1,11 +1,256 @@
-from sqlmodel import SQLModel, create_engine, Session
-from .config import DATABASE_URL
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from .config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, DATABASE_ASYNC, DATABASE_REPLICA_URLS,
+    REPLICA_CONNECT_TIMEOUT, REPLICA_READ_YOUR_WRITES_SECONDS,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+)
+from .metrics import instrument_engine
+from .pool import TimedQueuePool, TimedAsyncAdaptedQueuePool
+from .replicas import PRIMARY_UNTIL_COOKIE, READ_METHODS, client_key, read_replica_for, recent_writes, replica_health
 
-engine = create_engine(DATABASE_URL)
+logger = logging.getLogger(__name__)
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+def to_async_url(url: str) -> str:
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(hide_password=False)
+
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def replica_connect_args(url: str) -> dict:
+    """Bounds how long a request waits on an unreachable replica before falling back."""
+    url = make_url(url)
+    if url.get_backend_name() != "postgresql":
+        return {}
+    if url.get_driver_name() == "asyncpg":
+        return {"timeout": REPLICA_CONNECT_TIMEOUT}
+    return {"connect_timeout": REPLICA_CONNECT_TIMEOUT}
+
+def build_engine(url: Optional[str] = DATABASE_URL, replica: bool = False):
+    if not url:
+        raise RuntimeError("DATABASE_URL is not set")
+    connect_args = replica_connect_args(url) if replica else {}
+    engine = create_engine(url, poolclass=TimedQueuePool, connect_args=connect_args, **POOL_OPTIONS)
+    instrument_engine(engine)
+    return engine
+
+def build_async_engine(url: Optional[str] = None, replica: bool = False):
+    if not DATABASE_ASYNC:
+        return None
+    if url:
+        url = to_async_url(url)
+    elif ASYNC_DATABASE_URL or DATABASE_URL:
+        url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+    else:
+        raise RuntimeError("DATABASE_URL is not set")
+    connect_args = replica_connect_args(url) if replica else {}
+    async_engine = create_async_engine(url, poolclass=TimedAsyncAdaptedQueuePool, connect_args=connect_args, **POOL_OPTIONS)
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+ENGINE_BUILDERS = {"engine": build_engine, "async_engine": build_async_engine}
+# Pool labels used by the health and metrics routes.
+ENGINE_LABELS = {"engine": "sync", "async_engine": "async"}
+for index, replica_url in enumerate(DATABASE_REPLICA_URLS):
+    ENGINE_BUILDERS[f"replica{index}_engine"] = partial(build_engine, replica_url, replica=True)
+    ENGINE_BUILDERS[f"replica{index}_async_engine"] = partial(build_async_engine, replica_url, replica=True)
+    ENGINE_LABELS[f"replica{index}_engine"] = f"replica{index}"
+    ENGINE_LABELS[f"replica{index}_async_engine"] = f"replica{index}_async"
+
+def lazy_engine(name: str):
+    """
+    Engines are built on first use rather than at import, so importing the app
+    loads no database driver and a process that only needs one engine never
+    builds the other.
+    """
+    if name not in _engines:
+        with _engines_lock:
+            if name not in _engines:
+                _engines[name] = ENGINE_BUILDERS[name]()
+    return _engines[name]
+
+def get_engine(replica: Optional[int] = None):
+    """The primary's engine, or the engine of replica number `replica`."""
+    return lazy_engine("engine" if replica is None else f"replica{replica}_engine")
+
+def get_async_engine(replica: Optional[int] = None):
+    """Like get_engine for the async engines; None when DATABASE_ASYNC is off."""
+    return lazy_engine("async_engine" if replica is None else f"replica{replica}_async_engine")
+
+def built_engines() -> dict:
+    """
+    Engines constructed so far by pool label (`sync`, `async`, `replica0`,
+    `replica0_async`, ...), for reporting without building the others.
+    """
+    return {ENGINE_LABELS[name]: engine for name, engine in _engines.items() if engine}
+
+def __getattr__(name: str):
+    # Keeps `from app.core.database import engine` working for scripts.
+    if name in ENGINE_BUILDERS:
+        return lazy_engine(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def dialect_insert(table):
+    """
+    INSERT construct of the configured backend, which is what exposes
+    `on_conflict_do_update` for upserts. PostgreSQL and SQLite share the API.
+    """
+    if make_url(ASYNC_DATABASE_URL or DATABASE_URL).get_backend_name() == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+class ThreadedSession:
+    """
+    Exposes the awaitable AsyncSession API over a blocking Session, running
+    every database round trip on the threadpool. Used when DATABASE_ASYNC is
+    off so the routers are written once against a single interface.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    @property
+    def info(self) -> dict:
+        return self.sync_session.info
+
+    async def connection(self):
+        return await run_in_threadpool(self.sync_session.connection)
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def exec(self, statement, **kwargs):
+        return await run_in_threadpool(self.sync_session.exec, statement, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def refresh(self, instance, **kwargs):
+        await run_in_threadpool(self.sync_session.refresh, instance, **kwargs)
+
+    async def flush(self, objects=None):
+        await run_in_threadpool(self.sync_session.flush, objects)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def stream_partitions(self, statement, size: int):
+        result = await run_in_threadpool(self.sync_session.execute, statement.execution_options(yield_per=size))
+        partitions = result.partitions()
+        while partition := await run_in_threadpool(next, partitions, None):
+            yield partition
+
+async def stream_partitions(session, statement, size: int = 500):
+    """
+    Yields the rows of `statement` in lists of up to `size`, fetched from a
+    server-side cursor so only one partition is in memory at a time.
+    """
+    if isinstance(session, ThreadedSession):
+        async for partition in session.stream_partitions(statement, size):
+            yield partition
+    else:
+        result = await session.stream(statement.execution_options(yield_per=size))
+        async for partition in result.partitions():
+            yield partition
+
+def open_session(replica: Optional[int] = None):
+    if DATABASE_ASYNC:
+        session = AsyncSession(get_async_engine(replica), expire_on_commit=False)
+    else:
+        session = ThreadedSession(Session(get_engine(replica), expire_on_commit=False))
+    # Lets handlers hand the same target to work that opens its own session.
+    session.info["replica"] = replica
+    return session
+
+async def open_replica_session(replica: int):
+    """
+    Session on `replica` with its connection already checked out, or on the
+    primary when the replica cannot hand one out (it is then skipped for
+    REPLICA_RETRY_AFTER seconds).
+    """
+    session = open_session(replica)
+    try:
+        await session.connection()
+        return session
+    except Exception as e:
+        await session.close()
+        replica_health.mark_down(replica)
+        logger.warning("Replica %s is unavailable, reading from the primary: %s", replica, e)
+        return open_session()
+
+@asynccontextmanager
+async def session_scope(replica: Optional[int] = None):
+    """
+    Session on the primary, or on replica number `replica`. Also used outside
+    of request dependencies, e.g. for streaming responses that keep reading
+    after the handler has returned.
+    """
+    session = open_session() if replica is None else await open_replica_session(replica)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+async def get_session(request: Request, response: Response):
+    """
+    Request session: reads go to a healthy replica when DATABASE_REPLICA_URLS
+    is set, writes to the primary. After a write the client reads from the
+    primary for REPLICA_READ_YOUR_WRITES_SECONDS, tracked per worker by client
+    and across workers by a cookie.
+    """
+    is_write = bool(DATABASE_REPLICA_URLS) and request.method not in READ_METHODS
+    if is_write:
+        recent_writes.record(client_key(request))
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE, str(time.time() + REPLICA_READ_YOUR_WRITES_SECONDS),
+            max_age=int(REPLICA_READ_YOUR_WRITES_SECONDS) + 1, httponly=True, samesite="lax"
+        )
+
+    async with session_scope(read_replica_for(request)) as session:
+        # None when the replica was down and the primary serves the read.
+        request.state.replica = session.info["replica"]
+        yield session
+
+    if is_write:
+        # The window starts again once the write is committed.
+        recent_writes.record(client_key(request))
\ No newline at end of file
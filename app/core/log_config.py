@@ -0,0 +1,27 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from .config import LOG_LEVEL
+
+def setup_logging():
+    """
+    Routes the `app` loggers through a QueueHandler so request handlers only
+    enqueue records; a background QueueListener thread does the actual write.
+    """
+    app_logger = logging.getLogger("app")
+    if any(isinstance(handler, QueueHandler) for handler in app_logger.handlers):
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.propagate = False
\ No newline at end of file
@@ -0,0 +1,185 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Requests that matched no route share one label, so scanners probing random
+# paths cannot grow the number of series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+def format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        super().__init__(name, documentation, labels)
+        if not labels:
+            self._values[()] = 0
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [f"{self.name}{format_labels(self.labels, labels)} {value}" for labels, value in values]
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(labels, (None, 0.0))
+            if counts is None:
+                # One slot per bucket plus +Inf; cumulated when rendered.
+                counts = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self._values[labels] = (counts, total + value)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+
+        lines = self.header()
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip([*self.buckets, "+Inf"], counts):
+                cumulative += count
+                bucket = 'le="' + str(bound) + '"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, labels, bucket)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {total}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Time to answer a request, including streamed bodies.", ("method", "route"))
+REQUESTS = Counter("http_requests_total", "Answered requests.", ("method", "route", "status"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being answered right now.")
+REQUEST_QUERIES = Histogram("http_request_db_queries", "SQL statements run per request.", ("method", "route"), QUERY_BUCKETS)
+REQUEST_DB_TIME = Histogram("http_request_db_duration_seconds", "Time per request spent executing SQL statements.", ("method", "route"))
+
+METRICS = [REQUEST_LATENCY, REQUESTS, IN_FLIGHT, REQUEST_QUERIES, REQUEST_DB_TIME]
+
+@dataclass
+class RequestDBStats:
+    queries: int = 0
+    db_time: float = 0.0
+
+# Set by MetricsMiddleware for each request. Engine events fired on the
+# threadpool see it as well, since the threadpool copies the context.
+request_db_stats: contextvars.ContextVar[Optional[RequestDBStats]] = contextvars.ContextVar("request_db_stats", default=None)
+
+def instrument_engine(sync_engine):
+    """
+    Attributes every statement executed on `sync_engine` (pass
+    `async_engine.sync_engine` for an async engine) to the current request.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        stats = request_db_stats.get()
+        if stats is None:
+            return
+        stats.queries += 1
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            stats.db_time += time.perf_counter() - start
+
+def route_template(scope) -> str:
+    """
+    Template of the route that handled the request, with router prefixes.
+    Included routers may leave the route's own path in scope["route"]; the
+    prefix is then the leading segments of the path not covered by it.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    segments = scope["path"].split("/")
+    prefix_length = len(segments) - (len(template.split("/")) - 1)
+    return "/".join(segments[:prefix_length]) + template
+
+class MetricsMiddleware:
+    """
+    Records latency, status and database usage of every HTTP request, labelled
+    with the route template (`/api/v1/students/{instructor_id}`) rather than
+    the concrete path. Pure ASGI, so streamed bodies are timed to the last chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestDBStats()
+        token = request_db_stats.set(stats)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            request_db_stats.reset(token)
+
+            labels = (scope["method"], route_template(scope))
+            REQUEST_LATENCY.observe(labels, elapsed)
+            REQUESTS.inc((*labels, status))
+            REQUEST_QUERIES.observe(labels, stats.queries)
+            REQUEST_DB_TIME.observe(labels, stats.db_time)
+
+def render_metrics(extra: list[str] = ()) -> str:
+    lines = [line for metric in METRICS for line in metric.render()]
+    return "\n".join([*lines, *extra]) + "\n"
\ No newline at end of file
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class PoolWaitStats:
+    """
+    Running totals of the time spent inside the pool waiting for a
+    connection, including the connect time when a new one has to be opened.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, elapsed: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += elapsed
+            self.max_wait = max(self.max_wait, elapsed)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "total_wait_seconds": self.total_wait,
+                "avg_wait_seconds": self.total_wait / self.checkouts if self.checkouts else 0.0,
+                "max_wait_seconds": self.max_wait,
+            }
+
+def timed_pool(base: type[QueuePool]) -> type[QueuePool]:
+    """
+    Returns a subclass of `base` that records checkout wait times. Each pool
+    has its own stats, so the primary and replica engines report their waits
+    apart; `Pool.recreate()` after a dispose hands them to the new pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        base.__init__(self, *args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = base.recreate(self)
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+    # Keep SQLAlchemy's module so pool logging stays under the sqlalchemy.pool logger.
+    return type(f"Timed{base.__name__}", (base,), {"__init__": __init__, "recreate": recreate, "_do_get": _do_get, "__module__": base.__module__})
+
+TimedQueuePool = timed_pool(QueuePool)
+TimedAsyncAdaptedQueuePool = timed_pool(AsyncAdaptedQueuePool)
+
+def pool_status(pool: QueuePool) -> dict:
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.snapshot())
+    return status
\ No newline at end of file
@@ -0,0 +1,88 @@
+import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Request
+
+from .config import DATABASE_REPLICA_URLS, REPLICA_READ_YOUR_WRITES_SECONDS, REPLICA_RETRY_AFTER
+
+READ_METHODS = {"GET", "HEAD"}
+
+# Tells any worker that this client wrote recently, for clients that keep cookies.
+PRIMARY_UNTIL_COOKIE = "sv_primary_until"
+
+class ReplicaHealth:
+    """
+    Round-robin over the replicas that are not marked down. A replica that
+    fails to hand out a connection is skipped for REPLICA_RETRY_AFTER seconds.
+    """
+
+    def __init__(self, count: int, retry_after: float):
+        self.down_until = [0.0] * count
+        self.retry_after = retry_after
+        self._turn = itertools.count()
+
+    def pick(self) -> Optional[int]:
+        now = time.monotonic()
+        healthy = [index for index, until in enumerate(self.down_until) if until <= now]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def mark_down(self, index: int):
+        self.down_until[index] = time.monotonic() + self.retry_after
+
+class RecentWrites:
+    """
+    Bounded LRU of the last write time per client, so a client's reads go to
+    the primary until replication has had time to catch up.
+    """
+
+    def __init__(self, window: float, maxsize: int = 10000):
+        self.window = window
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def record(self, client: str):
+        with self._lock:
+            self._entries[client] = time.monotonic()
+            self._entries.move_to_end(client)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def wrote_recently(self, client: str) -> bool:
+        with self._lock:
+            written_at = self._entries.get(client)
+        return written_at is not None and time.monotonic() - written_at < self.window
+
+replica_health = ReplicaHealth(len(DATABASE_REPLICA_URLS), REPLICA_RETRY_AFTER)
+recent_writes = RecentWrites(REPLICA_READ_YOUR_WRITES_SECONDS)
+
+def client_key(request: Request) -> str:
+    """The bearer token identifies the client when there is one, else its address."""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    return request.client.host if request.client else ""
+
+def read_replica_for(request: Request) -> Optional[int]:
+    """
+    Index of the replica that should serve `request`, or None for the primary:
+    writes, clients inside their read-your-writes window and requests arriving
+    while every replica is down all use the primary.
+    """
+    if not DATABASE_REPLICA_URLS or request.method not in READ_METHODS:
+        return None
+
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+    if primary_until > time.time() or recent_writes.wrote_recently(client_key(request)):
+        return None
+
+    return replica_health.pick()
\ No newline at end of file
@@ -0,0 +1,63 @@
+from pathlib import Path
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from .database import get_async_engine, get_engine
+
+# Alembic is imported inside the functions: only startup needs it, and
+# importing it up front would add to every worker's import time.
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    # Keep the application's logging setup when running inside the app.
+    config.attributes["configure_logger"] = False
+    return config
+
+def head_revision() -> Optional[str]:
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+def read_revision(connection) -> Optional[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    return MigrationContext.configure(connection).get_current_revision()
+
+async def current_revision() -> Optional[str]:
+    """
+    Revision stamped in the database's alembic_version table. Reads it through
+    the engine requests use, so the check also opens the first pool connection.
+    """
+    async_engine = get_async_engine()
+    if async_engine:
+        async with async_engine.connect() as connection:
+            return await connection.run_sync(read_revision)
+
+    def read():
+        with get_engine().connect() as connection:
+            return read_revision(connection)
+
+    return await run_in_threadpool(read)
+
+async def check_schema_version():
+    """
+    One-row lookup instead of comparing every table like create_all does.
+    Raises SchemaVersionError when the database is not at the head revision.
+    """
+    current, head = await current_revision(), head_revision()
+    if current != head:
+        raise SchemaVersionError(
+            f"Database schema is at revision {current}, this code expects {head}. Run `alembic upgrade head`."
+        )
+
+def upgrade_schema():
+    from alembic import command
+
+    command.upgrade(alembic_config(), "head")
\ No newline at end of file
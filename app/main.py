@@ -1,9 +1,20 @@
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from app.routes import attendance
-from .routes import students, users
-from .core.database import create_db_and_tables
+from .routes import exports, health, jobs, metrics, students, sync, users
+from .core.config import DB_MIGRATE_ON_STARTUP, DB_SCHEMA_CHECK
+from .core.log_config import setup_logging
+from .core.metrics import MetricsMiddleware
+from .core.schema_version import check_schema_version, upgrade_schema
+from .services.job_service import job_runner
+from .services.pagination_service import NEXT_CURSOR_HEADER
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="SportView API",
@@ -14,6 +25,11 @@ app = FastAPI(
 app.include_router(students.router, prefix="/api/v1/students", tags=["Students"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
 app.include_router(attendance.router, prefix="/api/v1/attendance", tags=["Attendance"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["Exports"])
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["Jobs"])
+app.include_router(sync.router, prefix="/api/v1/sync", tags=["Sync"])
+app.include_router(health.router, prefix="/api/v1/health", tags=["Health"])
+app.include_router(metrics.router, tags=["Health"])
 
 origins = ["http://localhost:8100"]
 
@@ -23,12 +39,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Outermost, so the recorded latency covers the whole middleware stack.
+app.add_middleware(MetricsMiddleware)
+
 @app.on_event("startup")
-def on_startup():
-    print("[main - on_startup] Trying to create database and tables")
-    create_db_and_tables()
+async def on_startup():
+    if DB_MIGRATE_ON_STARTUP:
+        logger.info("Upgrading the database schema to the head revision")
+        await run_in_threadpool(upgrade_schema)
+    elif DB_SCHEMA_CHECK:
+        await check_schema_version()
+    job_runner.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await job_runner.stop()
 
 @app.get("/")
 async def root():
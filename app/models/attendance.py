@@ -1,10 +1,33 @@
+from sqlalchemy import Index, UniqueConstraint, func
 from sqlmodel import SQLModel, Field
 from typing import Optional
-from datetime import date as Date
+from datetime import date as Date, datetime
 
 class Attendance(SQLModel, table=True):
+    __table_args__ = (
+        # Also serves lookups by student (avg and per-student history) as (student_id, date).
+        UniqueConstraint("student_id", "date", name="uq_attendance_student_date"),
+        # get_attendances and get_dates: equality on instructor, then date; covers the selected columns.
+        Index("ix_attendance_instructor_id_date", "instructor_id", "date", postgresql_include=["student_id", "present"]),
+        # Delta sync: attendance of a student changed since a version.
+        Index("ix_attendance_student_id_version", "student_id", "version"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     instructor_id: int = Field(foreign_key="user.id")
     student_id: int = Field(foreign_key="student.id")
     date: Date = Field(index=True)
-    present: bool
\ No newline at end of file
+    present: bool
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.current_timestamp()})
+
+class AttendanceMonthly(SQLModel, table=True):
+    """
+    Per-student monthly attendance counts, kept in step with Attendance by the
+    write handlers so averages never scan a student's full history.
+    """
+    student_id: int = Field(foreign_key="student.id", primary_key=True)
+    year: int = Field(primary_key=True)
+    month: int = Field(primary_key=True)
+    present_count: int = 0
+    total_count: int = 0
\ No newline at end of file
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Index, Text, text
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+ACTIVE_JOB_CONDITION = text("status IN ('pending', 'running')")
+
+class Job(SQLModel, table=True):
+    """
+    Durable record of a background job. `key` identifies the kind and
+    parameters, so identical submissions share the pending job or the cached
+    result. `params` and `result` hold JSON text.
+    """
+    __table_args__ = (
+        # At most one pending or running job per key, across every worker.
+        Index("uq_job_key_active", "key", unique=True, postgresql_where=ACTIVE_JOB_CONDITION, sqlite_where=ACTIVE_JOB_CONDITION),
+        Index("ix_job_key_finished_at", "key", "finished_at"),
+        Index("ix_job_status", "status"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str
+    key: str
+    params: str = Field(sa_column=Column(Text, nullable=False))
+    status: str = JOB_PENDING
+    result: Optional[str] = Field(default=None, sa_column=Column(Text))
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
\ No newline at end of file
@@ -1,10 +1,16 @@
+from sqlalchemy import Index, func
 from sqlmodel import SQLModel, Field
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 class Student(SQLModel, table=True):
+    __table_args__ = (
+        # Delta sync: an instructor's students changed since a version.
+        Index("ix_student_instructor_id_version", "instructor_id", "version"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    instructor_id: int = Field(foreign_key="user.id")
+    instructor_id: int = Field(foreign_key="user.id", index=True)
     name: str
     email: str = Field(index=True)
     rut: str = Field(index=True)
@@ -12,11 +18,21 @@ class Student(SQLModel, table=True):
     age: Optional[int]
     weight: Optional[float]
     height: Optional[float]
+    # Stamped by every write from the sync clock; see app.models.sync.
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.current_timestamp()})
 
 class StudentProgress(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_studentprogress_student_id_progress_date", "student_id", "progress_date"),
+        Index("ix_studentprogress_student_id_version", "student_id", "version"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     student_id: int = Field(foreign_key="student.id")
     progress_date: date
     technique: Optional[int]
     physique: Optional[int]
-    combat_iq: Optional[int]
\ No newline at end of file
+    combat_iq: Optional[int]
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.current_timestamp()})
\ No newline at end of file
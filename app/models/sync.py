@@ -0,0 +1,34 @@
+from sqlalchemy import Index
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+SYNC_STUDENT = "student"
+SYNC_ATTENDANCE = "attendance"
+SYNC_PROGRESS = "progress"
+
+class SyncClock(SQLModel, table=True):
+    """
+    Per-instructor counter behind the `version` columns of the instructor's
+    students, attendance and progress. A write transaction takes the next
+    value before its first write and holds the row lock until it commits, so
+    an instructor's versions become visible in increasing order.
+    """
+    instructor_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    version: int = 0
+
+class SyncTombstone(SQLModel, table=True):
+    """
+    A synced row that left an instructor's scope: deleted, or moved to a
+    student of another instructor. `entity` is one of the SYNC_* names.
+    """
+    __table_args__ = (
+        Index("ix_synctombstone_instructor_id_version", "instructor_id", "version"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    instructor_id: int
+    entity: str
+    entity_id: int
+    version: int
+    deleted_at: datetime
\ No newline at end of file
@@ -1,59 +1,312 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
-from sqlalchemy import Float, Integer, cast, func
-from sqlmodel import Session, and_, extract, select, update
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import case, delete, func, insert, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import and_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import date as Date
+from typing import Iterable, Optional
 
-from app.models.attendance import Attendance
-from app.models.student import Student
-from app.schemas.attendance import AttendanceAvg, AttendanceResponse
+from app.models.attendance import Attendance, AttendanceMonthly
+from app.models.student import Student, StudentProgress
+from app.schemas.attendance import AttendanceAvg, AttendanceBulkDeleteResult, AttendanceBulkResult, AttendanceCreate, AttendanceMatrixResponse, AttendanceResponse, ClassSession, ClassSessionResult, ClassSessionStudent
+from app.services.cache_service import instructor_attendance_tag, instructor_students_tag, response_cache, student_progress_tag
 from app.services.jwt_service import token_verifier
-from ..core.database import get_session
+from app.services.matrix_service import attendance_matrix_json
+from app.services.pagination_service import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, stream_json_array
+from app.services.sync_service import SYNC_ATTENDANCE, UNSTAMPED_VERSION, next_student_sync_version, next_sync_version, stamp_rows, student_instructors, sync_stamp, tombstone_attendance, tombstone_reassigned
+from app.services.serialization_service import JSONBytesResponse, rows_to_json, schema_fields, values_to_json
+from app.services.rollup_service import refresh_attendance_rollups, rollup_keys
+from ..core.database import dialect_insert, get_session
 
 router = APIRouter()
 
+NDJSON_BATCH_SIZE = 1000
+MAX_MATRIX_DAYS = 366
+ATTENDANCE_RESPONSE_FIELDS = schema_fields(AttendanceResponse)
+PROGRESS_SCORES = ("technique", "physique", "combat_iq")
+
+async def insert_attendances(session: AsyncSession, attendances: list[AttendanceCreate], version: int, refresh_rollups: bool = True) -> list[int]:
+    """
+    Inserts the whole batch as one multi-row INSERT ... RETURNING stamped
+    with sync `version`, refreshes the monthly rollups it touches (unless the
+    caller does it later) and returns the generated ids in the same order as
+    `attendances`. Ids are matched back on (student_id, date), which is
+    unique, so the database is free to return them in any order.
+    """
+    if not attendances:
+        return []
+
+    stamp = sync_stamp(version)
+    statement = insert(Attendance).returning(Attendance.id, Attendance.student_id, Attendance.date)
+    result = await session.execute(statement, [{**attendance.model_dump(), **stamp} for attendance in attendances])
+    ids = {(student_id, date): attendance_id for attendance_id, student_id, date in result}
+
+    if refresh_rollups:
+        await refresh_attendance_rollups(session, rollup_keys(attendances))
+    return [ids[(attendance.student_id, attendance.date)] for attendance in attendances]
+
+async def upsert_attendance_rows(session: AsyncSession, attendances: Iterable[AttendanceCreate], version: int) -> tuple[list[int], set[int]]:
+    """
+    Inserts or corrects attendance keyed on (student_id, date) with one
+    INSERT ... ON CONFLICT DO UPDATE stamped with sync `version` and refreshes
+    the monthly rollups it touches. When a student appears twice for the same
+    date the last entry wins. Also returns the instructors of the rows that
+    existed before, whose cached attendance goes stale if a correction moves
+    a row to another instructor.
+    """
+    latest = {(attendance.student_id, attendance.date): attendance for attendance in attendances}
+    if not latest:
+        return [], set()
+
+    previous_instructor_ids = set((await session.exec(
+        select(Attendance.instructor_id).where(tuple_(Attendance.student_id, Attendance.date).in_(list(latest))).distinct()
+    )).all())
+
+    statement = dialect_insert(Attendance)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Attendance.student_id, Attendance.date],
+        set_={
+            "instructor_id": statement.excluded.instructor_id,
+            "present": statement.excluded.present,
+            "version": statement.excluded.version,
+            "updated_at": statement.excluded.updated_at,
+        },
+    ).returning(Attendance.id, Attendance.student_id, Attendance.date)
+    stamp = sync_stamp(version)
+    result = await session.execute(statement, [{**attendance.model_dump(), **stamp} for attendance in latest.values()])
+    ids = {(student_id, date): attendance_id for attendance_id, student_id, date in result}
+    await refresh_attendance_rollups(session, rollup_keys(latest.values()))
+    return [ids[key] for key in latest], previous_instructor_ids
+
+def is_duplicate_attendance(error: IntegrityError) -> bool:
+    """Whether `error` is the (student_id, date) unique constraint, as PostgreSQL or SQLite word it."""
+    message = str(error.orig)
+    return "uq_attendance_student_date" in message or "attendance.student_id, attendance.date" in message
+
+def duplicate_attendance() -> HTTPException:
+    return HTTPException(status_code=409, detail="Attendance is already recorded for a student on one of these dates; use PUT /upsert to correct it")
+
+def has_scores(student: ClassSessionStudent) -> bool:
+    return any(getattr(student, score) is not None for score in PROGRESS_SCORES)
+
+async def upsert_class_progress(session: AsyncSession, progress_date: Date, students: list[ClassSessionStudent], version: int) -> list[int]:
+    """
+    Writes the scores given for `progress_date` in two statements: one UPDATE
+    of the students that already have progress that day, scores picked per
+    student with CASE (scores left out keep their value), then one INSERT for
+    the rest. Students with no score are skipped; a student listed twice
+    counts once, with their last entry.
+    """
+    latest = {student.student_id: student for student in students}
+    scored = {student_id: student for student_id, student in latest.items() if has_scores(student)}
+    if not scored:
+        return []
+
+    stamp = sync_stamp(version)
+    values = dict(stamp)
+    for score in PROGRESS_SCORES:
+        column = getattr(StudentProgress, score)
+        given = {student_id: getattr(student, score) for student_id, student in scored.items() if getattr(student, score) is not None}
+        if given:
+            values[score] = case(given, value=StudentProgress.student_id, else_=column)
+
+    statement = (
+        update(StudentProgress)
+        .where(and_(StudentProgress.progress_date == progress_date, StudentProgress.student_id.in_(scored)))
+        .values(**values)
+        .returning(StudentProgress.id, StudentProgress.student_id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = (await session.execute(statement)).all()
+    ids = [progress_id for progress_id, _ in updated]
+
+    missing = scored.keys() - {student_id for _, student_id in updated}
+    if missing:
+        statement = insert(StudentProgress).returning(StudentProgress.id, StudentProgress.student_id)
+        result = await session.execute(statement, [
+            {"student_id": student_id, "progress_date": progress_date, **{score: getattr(scored[student_id], score) for score in PROGRESS_SCORES}, **stamp}
+            for student_id in sorted(missing)
+        ])
+        inserted = {student_id: progress_id for progress_id, student_id in result}
+        ids.extend(inserted[student_id] for student_id in sorted(missing))
+    return ids
+
+# Statements of the hot read routes, shared with scripts/explain_queries.py.
+
+def attendances_on_date_statement(instructor_id: int, date: Date):
+    # Column order matches AttendanceResponse: rows are encoded positionally.
+    return (
+        select(
+            Attendance.id,
+            Attendance.instructor_id,
+            Attendance.student_id,
+            (Student.name).label("student_name"),
+            Attendance.date,
+            Attendance.present
+        )
+        .join(Student, Attendance.student_id == Student.id)
+        .where(
+            and_(
+                Attendance.instructor_id == instructor_id,
+                Attendance.date == date
+            )
+        )
+        .order_by(Attendance.id)
+    )
+
+def attendance_dates_statement(instructor_id: int):
+    return select(Attendance.date).where(Attendance.instructor_id == instructor_id).distinct().order_by(Attendance.date)
+
+def attendance_avg_statement(student_id: int, month: int, year: Optional[int] = None):
+    conditions = [AttendanceMonthly.student_id == student_id]
+    if year is not None:
+        conditions.append(AttendanceMonthly.year == year)
+    if month != 0:
+        conditions.append(AttendanceMonthly.month == month)
+
+    return (
+        select(
+            func.sum(AttendanceMonthly.present_count).label("present_count"),
+            func.sum(AttendanceMonthly.total_count).label("total_count")
+        )
+        .where(and_(*conditions))
+    )
+
+async def invalidate_attendance_dates(instructor_ids):
+    await response_cache.invalidate(*{instructor_attendance_tag(instructor_id) for instructor_id in instructor_ids})
+
 @router.post(
-    "/"
+    "/",
+    response_model=AttendanceBulkResult
 )
-def add_attendances(attendances: list[Attendance], session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):   
-    try:
-        session.add_all(attendances)
-        session.commit()
-        
-        for attendance in attendances:
-            session.refresh(attendance)
+async def add_attendances(attendances: list[AttendanceCreate], session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):   
+    if not attendances:
+        return AttendanceBulkResult(message="Attendance added.", ids=[])
+    if len({(attendance.student_id, attendance.date) for attendance in attendances}) < len(attendances):
+        raise HTTPException(status_code=422, detail="A student appears more than once for the same date")
 
+    try:
+        version = await next_student_sync_version(session, {attendance.student_id for attendance in attendances})
+        ids = await insert_attendances(session, attendances, version)
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if is_duplicate_attendance(e):
+            raise duplicate_attendance()
+        print(f"An error has ocurred on third section: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
     except Exception as e:
+        await session.rollback()
         print(f"An error has ocurred on third section: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    
 
-    return {"message": "Attendance added."}
+    await invalidate_attendance_dates(attendance.instructor_id for attendance in attendances)
+    return AttendanceBulkResult(message="Attendance added.", ids=ids)
+
+@router.post(
+    "/ndjson",
+    response_model=AttendanceBulkResult
+)
+async def add_attendances_ndjson(request: Request, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    """
+    Backfill endpoint: the body is newline-delimited JSON, one attendance per
+    line. Lines are parsed as they arrive and written in batches of
+    NDJSON_BATCH_SIZE inside a single transaction, so the request body is never
+    held in memory as a whole. The rows are stamped for delta sync once the
+    body is in, so a slow upload does not hold the instructors' sync clocks;
+    the monthly rollups are refreshed after the clocks are taken, in the same
+    lock order as every other attendance write.
+    """
+    ids = []
+    batch = []
+    instructor_ids = set()
+    student_ids = set()
+    months = set()
+    buffer = b""
+    line_number = 0
+
+    async def lines():
+        nonlocal buffer
+        async for chunk in request.stream():
+            buffer += chunk
+            *complete, buffer = buffer.split(b"\n")
+            for line in complete:
+                yield line
+        if buffer:
+            yield buffer
+
+    async def insert_batch(batch: list[AttendanceCreate]) -> list[int]:
+        student_ids.update(attendance.student_id for attendance in batch)
+        months.update(rollup_keys(batch))
+        return await insert_attendances(session, batch, UNSTAMPED_VERSION, refresh_rollups=False)
+
+    try:
+        async for line in lines():
+            line_number += 1
+            if not line.strip():
+                continue
+
+            batch.append(AttendanceCreate.model_validate_json(line))
+            instructor_ids.add(batch[-1].instructor_id)
+            if len(batch) >= NDJSON_BATCH_SIZE:
+                ids.extend(await insert_batch(batch))
+                batch = []
+
+        ids.extend(await insert_batch(batch))
+        if ids:
+            await stamp_rows(session, Attendance, ids, await next_student_sync_version(session, student_ids))
+            await refresh_attendance_rollups(session, months)
+        await session.commit()
+    except ValidationError as e:
+        await session.rollback()
+        raise HTTPException(status_code=422, detail=f"Invalid attendance on line {line_number}: {e.errors(include_url=False)}")
+    except IntegrityError as e:
+        await session.rollback()
+        if is_duplicate_attendance(e):
+            raise duplicate_attendance()
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    except Exception as e:
+        await session.rollback()
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    await invalidate_attendance_dates(instructor_ids)
+    return AttendanceBulkResult(message="Attendance added.", ids=ids)
 
 @router.get(
     "/all/{instructor_id}/{date}",
     response_model=list[AttendanceResponse]
 )
-def get_attendances(instructor_id: int, date: Date, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
-    try:
-        statement = (
-            select(
-                Attendance.id,
-                Attendance.instructor_id,
-                Attendance.student_id,
-                (Student.name).label("student_name"),
-                Attendance.date,
-                Attendance.present
-            )
-            .join(Student, Attendance.student_id == Student.id)
-            .where(
-                and_(
-                    Attendance.instructor_id == instructor_id,
-                    Attendance.date == date
-                )
-            )
+async def get_attendances(
+    instructor_id: int,
+    date: Date,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """
+    Paginated and streamed the same way as read_students: `limit` plus the
+    X-Next-Cursor header, or `stream=true`.
+    """
+    statement = attendances_on_date_statement(instructor_id, date)
+    if cursor:
+        statement = statement.where(Attendance.id > decode_cursor(cursor))
+    if limit:
+        statement = statement.limit(limit)
+
+    if stream:
+        return StreamingResponse(
+            stream_json_array(statement, ATTENDANCE_RESPONSE_FIELDS, session.info.get("replica")),
+            media_type="application/json"
         )
-        result = session.exec(statement)
+
+    try:
+        result = await session.exec(statement)
         attendances = result.all()
     except Exception as e:
         print(f"An error has ocurred: {e}")
@@ -61,92 +314,272 @@ def get_attendances(instructor_id: int, date: Date, session: Session = Depends(g
 
     if not attendances:
         raise HTTPException(status_code=404, detail="Attendances not found")
+
+    headers = {}
+    if limit and len(attendances) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(attendances[-1].id)
     
-    return attendances
+    return JSONBytesResponse(rows_to_json(attendances, ATTENDANCE_RESPONSE_FIELDS), headers=headers)
+
+@router.get(
+    "/matrix/{instructor_id}",
+    response_model=AttendanceMatrixResponse
+)
+async def get_attendance_matrix(
+    instructor_id: int,
+    start: Date,
+    end: Date,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """
+    An instructor's attendance grid between `start` and `end`, both included,
+    in one query: a column per class date and a row per student, with
+    `cells[i]` the student's attendance on `dates[i]`. Replaces calling
+    get_dates and then get_attendances for every date.
+    """
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= MAX_MATRIX_DAYS:
+        raise HTTPException(status_code=400, detail=f"The range can span at most {MAX_MATRIX_DAYS} days")
+
+    async def load(headers: dict):
+        try:
+            statement = (
+                select(Attendance.student_id, Student.name, Attendance.date, Attendance.present)
+                .join(Student, Attendance.student_id == Student.id)
+                .where(and_(Attendance.instructor_id == instructor_id, Attendance.date >= start, Attendance.date <= end))
+                .order_by(Student.name, Attendance.student_id)
+            )
+            rows = (await session.exec(statement)).all()
+        except Exception as e:
+            print(f"An error has ocurred: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="Attendances not found")
+
+        return attendance_matrix_json(instructor_id, start, end, rows)
+
+    # Tagged with the roster too: renaming a student changes the answer.
+    return await response_cache.respond(request, [instructor_attendance_tag(instructor_id), instructor_students_tag(instructor_id)], load)
 
 @router.put("/")
-def update_attendances(
+async def update_attendances(
     attendances: list[Attendance],
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     dependencies = [Depends(token_verifier)]
 ):
+    attendances = [Attendance.model_validate(attendance, from_attributes=True) for attendance in attendances]
     try:
-        with session.begin():
-            for attendance in attendances:
-                existing_attendance = session.get(Attendance, attendance.id)
-
-                if existing_attendance:
-                    existing_attendance.instructor_id = attendance.instructor_id
-                    existing_attendance.student_id = attendance.student_id
-                    existing_attendance.date = attendance.date
-                    existing_attendance.present = attendance.present
-                else:
-                    raise HTTPException(status_code=404, detail=f"Attendance with id {attendance.id} not found")
+        statement = select(Attendance).where(Attendance.id.in_([attendance.id for attendance in attendances]))
+        existing_attendances = {attendance.id: attendance for attendance in (await session.exec(statement)).all()}
+        touched_rollups = rollup_keys(existing_attendances.values()) | rollup_keys(attendances)
+        touched_instructors = {attendance.instructor_id for attendance in [*existing_attendances.values(), *attendances]}
+        moves = {
+            attendance.id: (existing_attendances[attendance.id].student_id, attendance.student_id)
+            for attendance in attendances
+            if attendance.id in existing_attendances and existing_attendances[attendance.id].student_id != attendance.student_id
+        }
+
+        instructors = await student_instructors(session, {attendance.student_id for attendance in [*existing_attendances.values(), *attendances]})
+        version = await next_sync_version(session, instructors.values())
+        stamp = sync_stamp(version)
+        for attendance in attendances:
+            existing_attendance = existing_attendances.get(attendance.id)
+
+            if existing_attendance:
+                existing_attendance.instructor_id = attendance.instructor_id
+                existing_attendance.student_id = attendance.student_id
+                existing_attendance.date = attendance.date
+                existing_attendance.present = attendance.present
+                existing_attendance.sqlmodel_update(stamp)
+            else:
+                raise HTTPException(status_code=404, detail=f"Attendance with id {attendance.id} not found")
 
+        await tombstone_reassigned(session, version, SYNC_ATTENDANCE, moves, instructors)
+        await refresh_attendance_rollups(session, touched_rollups)
+        await session.commit()
+
+        await invalidate_attendance_dates(touched_instructors)
         return {"message": "Attendances updated successfully"}
 
     except HTTPException as e:
         print(f"An error has ocurred: {e}")
-        session.rollback()
+        await session.rollback()
+
+    except Exception as e:
+        await session.rollback()
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.put(
+    "/upsert",
+    response_model=AttendanceBulkResult
+)
+async def upsert_attendances(attendances: list[AttendanceCreate], session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    """
+    Inserts or corrects a class's attendance keyed on (student_id, date), so
+    clients do not need row ids. The whole batch is one INSERT ... ON CONFLICT
+    DO UPDATE; when a student appears twice for the same date the last entry wins.
+    """
+    if not attendances:
+        return AttendanceBulkResult(message="Attendances upserted successfully", ids=[])
+
+    try:
+        version = await next_student_sync_version(session, {attendance.student_id for attendance in attendances})
+        ids, previous_instructor_ids = await upsert_attendance_rows(session, attendances, version)
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    await invalidate_attendance_dates({attendance.instructor_id for attendance in attendances} | previous_instructor_ids)
+    return AttendanceBulkResult(message="Attendances upserted successfully", ids=ids)
 
+@router.post(
+    "/session",
+    response_model=ClassSessionResult
+)
+async def record_class_session(class_session: ClassSession, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    """
+    Records a whole class in one transaction: every student's attendance for
+    the date (upserted as in PUT /upsert) and, for students given any of
+    technique, physique or combat_iq, their progress for the date (the entry
+    already recorded that day is updated, otherwise one is created).
+    """
+    attendances = [
+        AttendanceCreate(instructor_id=class_session.instructor_id, student_id=student.student_id, date=class_session.date, present=student.present)
+        for student in class_session.students
+    ]
+    try:
+        version = await next_student_sync_version(session, {student.student_id for student in class_session.students})
+        attendance_ids, previous_instructor_ids = await upsert_attendance_rows(session, attendances, version)
+        progress_ids = await upsert_class_progress(session, class_session.date, class_session.students, version)
+        await session.commit()
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+    await response_cache.invalidate(
+        *{instructor_attendance_tag(instructor_id) for instructor_id in previous_instructor_ids | {class_session.instructor_id}},
+        *{student_progress_tag(student.student_id) for student in class_session.students if has_scores(student)}
+    )
+    return ClassSessionResult(message="Class session recorded", attendance_ids=attendance_ids, progress_ids=progress_ids)
+
 @router.delete("/{attendance_id}")
-def delete_attendance(attendance_id: int, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def delete_attendance(attendance_id: int, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:
         statement = select(Attendance).where(Attendance.id == attendance_id)
-        result = session.exec(statement)
+        result = await session.exec(statement)
         attendance = result.first()
 
         if not attendance:
             raise HTTPException(status_code=404, detail="Attendance not found")
         
-        session.delete(attendance)
-        session.commit()
+        await tombstone_attendance(session, Attendance.id == attendance_id)
+        await session.delete(attendance)
+        await refresh_attendance_rollups(session, rollup_keys([attendance]))
+        await session.commit()
 
+        await invalidate_attendance_dates([attendance.instructor_id])
         return {"message": "Attendance deleted successfully"}
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.delete(
+    "/instructor/{instructor_id}",
+    response_model=AttendanceBulkDeleteResult
+)
+async def delete_attendances_in_range(
+    instructor_id: int,
+    start: Date,
+    end: Date,
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """
+    Deletes all attendance an instructor took between `start` and `end`, both
+    included, with a single DELETE, tombstones it for delta sync and refreshes
+    the monthly rollups it touched.
+    """
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    try:
+        in_range = and_(Attendance.instructor_id == instructor_id, Attendance.date >= start, Attendance.date <= end)
+        await tombstone_attendance(session, in_range)
+        statement = delete(Attendance).where(in_range).returning(Attendance.student_id, Attendance.date)
+        deleted = (await session.execute(statement)).all()
+        await refresh_attendance_rollups(session, rollup_keys(deleted))
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    await invalidate_attendance_dates([instructor_id])
+    return AttendanceBulkDeleteResult(message="Attendances deleted successfully", deleted=len(deleted))
+
 @router.get(
     "/dates/{instructor_id}",
     response_model=list[Date]
 )
-def get_dates(instructor_id: int, session: Session = Depends(get_session)):
+async def get_dates(instructor_id: int, request: Request, session: AsyncSession = Depends(get_session)):
+    async def load(headers: dict):
+        try:
+            results = (await session.exec(attendance_dates_statement(instructor_id))).all()
+        except Exception as e:
+            print(f"An error has ocurred: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+        if not results:
+            raise HTTPException(status_code=404, detail="Dates not found")
+        
+        return values_to_json(results)
+
+    return await response_cache.respond(request, [instructor_attendance_tag(instructor_id)], load)
+
+async def read_attendance_avg(session: AsyncSession, student_id: int, month: int, year: Optional[int] = None) -> Optional[float]:
+    """
+    Attendance rate from the monthly rollups. `month` 0 means every month, and
+    `year` None every year, which is what the original month-only route did.
+    """
+    present_count, total_count = (await session.exec(attendance_avg_statement(student_id, month, year))).one()
+
+    if not total_count:
+        return None
+    return present_count / total_count
+
+@router.get("/avg/{student_id}/{month}", response_model=AttendanceAvg)
+async def get_avg_attendance(
+    student_id: int,
+    month: int,
+    session: AsyncSession = Depends(get_session),
+):
     try:
-        statement = select(Attendance.date).where(Attendance.instructor_id == instructor_id).distinct().order_by(Attendance.date)
-        results = session.exec(statement).all()
+        result = await read_attendance_avg(session, student_id, month)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-    if not results:
-        raise HTTPException(status_code=404, detail="Dates not found")
-    
-    return results
+    if result is None:
+        raise HTTPException(status_code=404, detail="Student not found or no attendance data.")
+    return AttendanceAvg(student_id=student_id, avg_attendance=result)
 
-@router.get("/avg/{student_id}/{month}", response_model=AttendanceAvg)
-def get_avg_attendance(
+@router.get("/avg/{student_id}/{year}/{month}", response_model=AttendanceAvg)
+async def get_avg_attendance_by_year(
     student_id: int,
+    year: int,
     month: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     try:
-        if month != 0:
-            query = (
-                select(func.avg(cast(Attendance.present, Integer)).label("avg_attendance"))
-                .where(and_(Attendance.student_id == student_id, extract("month", Attendance.date) == month))
-            )
-        else:
-            query = (
-                select(func.avg(cast(Attendance.present, Integer)).label("avg_attendance"))
-                .where(Attendance.student_id == student_id)
-            )
-        result = session.exec(query).first()
+        result = await read_attendance_avg(session, student_id, month, year)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -155,4 +588,64 @@ def get_avg_attendance(
         raise HTTPException(status_code=404, detail="Student not found or no attendance data.")
     return AttendanceAvg(student_id=student_id, avg_attendance=result)
 
-    
\ No newline at end of file
+async def read_instructor_attendance_avgs(session: AsyncSession, instructor_id: int, month: int, year: Optional[int] = None) -> list[AttendanceAvg]:
+    """
+    Attendance rate of every student of an instructor in one GROUP BY over the
+    monthly rollups. Students without attendance in the period get 0.
+    """
+    conditions = [AttendanceMonthly.student_id == Student.id]
+    if year is not None:
+        conditions.append(AttendanceMonthly.year == year)
+    if month != 0:
+        conditions.append(AttendanceMonthly.month == month)
+
+    query = (
+        select(
+            Student.id,
+            func.sum(AttendanceMonthly.present_count).label("present_count"),
+            func.sum(AttendanceMonthly.total_count).label("total_count")
+        )
+        .outerjoin(AttendanceMonthly, and_(*conditions))
+        .where(Student.instructor_id == instructor_id)
+        .group_by(Student.id)
+        .order_by(Student.id)
+    )
+    rows = (await session.exec(query)).all()
+
+    return [
+        AttendanceAvg(student_id=student_id, avg_attendance=present_count / total_count if total_count else 0)
+        for student_id, present_count, total_count in rows
+    ]
+
+@router.get("/instructor-avg/{instructor_id}/{month}", response_model=list[AttendanceAvg])
+async def get_instructor_avg_attendance(
+    instructor_id: int,
+    month: int,
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        results = await read_instructor_attendance_avgs(session, instructor_id, month)
+    except Exception as e:
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    if not results:
+        raise HTTPException(status_code=404, detail="Students not found")
+    return results
+
+@router.get("/instructor-avg/{instructor_id}/{year}/{month}", response_model=list[AttendanceAvg])
+async def get_instructor_avg_attendance_by_year(
+    instructor_id: int,
+    year: int,
+    month: int,
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        results = await read_instructor_attendance_avgs(session, instructor_id, month, year)
+    except Exception as e:
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    if not results:
+        raise HTTPException(status_code=404, detail="Students not found")
+    return results
\ No newline at end of file
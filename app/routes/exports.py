@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlmodel import and_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import date as Date
+from typing import Literal
+
+from app.models.attendance import Attendance
+from app.models.student import Student, StudentProgress
+from app.services.export_service import CSV_MEDIA_TYPE, PARQUET_MEDIA_TYPE, parquet_available, stream_csv, stream_parquet
+from app.services.jwt_service import token_verifier
+from ..core.database import get_session
+
+router = APIRouter()
+
+ATTENDANCE_EXPORT_COLUMNS = (
+    ("id", "int64"),
+    ("student_id", "int64"),
+    ("student_name", "string"),
+    ("date", "date32"),
+    ("present", "bool"),
+)
+PROGRESS_EXPORT_COLUMNS = (
+    ("id", "int64"),
+    ("student_id", "int64"),
+    ("student_name", "string"),
+    ("progress_date", "date32"),
+    ("technique", "int32"),
+    ("physique", "int32"),
+    ("combat_iq", "int32"),
+)
+
+def export_response(statement, columns: tuple, name: str, format: str, replica) -> StreamingResponse:
+    """
+    Streams `statement` as CSV or Parquet. The body is produced batch by batch
+    from a server-side cursor, so memory stays flat whatever the range.
+    """
+    if format == "parquet":
+        if not parquet_available():
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+        body, media_type = stream_parquet(statement, columns, replica), PARQUET_MEDIA_TYPE
+    else:
+        body, media_type = stream_csv(statement, [name for name, _ in columns], replica), CSV_MEDIA_TYPE
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    )
+
+def check_range(start: Date, end: Date):
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+@router.get("/attendance/{instructor_id}")
+async def export_attendance(
+    instructor_id: int,
+    start: Date,
+    end: Date,
+    format: Literal["csv", "parquet"] = "csv",
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """Attendance an instructor took between `start` and `end`, both included, with student names."""
+    check_range(start, end)
+    statement = (
+        select(Attendance.id, Attendance.student_id, Student.name, Attendance.date, Attendance.present)
+        .join(Student, Attendance.student_id == Student.id)
+        .where(and_(Attendance.instructor_id == instructor_id, Attendance.date >= start, Attendance.date <= end))
+        .order_by(Attendance.date, Attendance.id)
+    )
+    name = f"attendance-{instructor_id}-{start}-{end}"
+    return export_response(statement, ATTENDANCE_EXPORT_COLUMNS, name, format, session.info.get("replica"))
+
+@router.get("/progress/{instructor_id}")
+async def export_progress(
+    instructor_id: int,
+    start: Date,
+    end: Date,
+    format: Literal["csv", "parquet"] = "csv",
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """Progress of an instructor's students recorded between `start` and `end`, both included."""
+    check_range(start, end)
+    statement = (
+        select(
+            StudentProgress.id,
+            StudentProgress.student_id,
+            Student.name,
+            StudentProgress.progress_date,
+            StudentProgress.technique,
+            StudentProgress.physique,
+            StudentProgress.combat_iq
+        )
+        .join(Student, StudentProgress.student_id == Student.id)
+        .where(and_(Student.instructor_id == instructor_id, StudentProgress.progress_date >= start, StudentProgress.progress_date <= end))
+        .order_by(StudentProgress.progress_date, StudentProgress.id)
+    )
+    name = f"progress-{instructor_id}-{start}-{end}"
+    return export_response(statement, PROGRESS_EXPORT_COLUMNS, name, format, session.info.get("replica"))
\ No newline at end of file
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.core.database import ENGINE_LABELS, built_engines
+from app.core.pool import pool_status
+
+router = APIRouter()
+
+@router.get("/pool")
+async def get_pool_status():
+    engines = built_engines()
+    return {label: pool_status(engines[label].pool) if label in engines else None for label in ENGINE_LABELS.values()}
\ No newline at end of file
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.job import JOB_DONE, Job
+from app.schemas.jobs import JobStatus, JobSubmit
+from app.services.job_service import JOB_KINDS, job_runner, submit_job
+from app.services.jwt_service import token_verifier
+from app.services.serialization_service import JSONBytesResponse
+from ..core.database import get_session
+
+router = APIRouter()
+
+async def read_job(session: AsyncSession, job_id: int) -> Job:
+    try:
+        job = await session.get(Job, job_id)
+    except Exception as e:
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/", response_model=JobStatus, status_code=202)
+async def create_job(job_submit: JobSubmit, response: Response, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    """
+    Queues a report to be computed in the background. Submitting the same
+    kind and parameters again returns the job already pending or running, or
+    the one that finished less than JOB_RESULT_TTL seconds ago (answered with
+    200 instead of 202), so its result can be fetched straight away.
+    """
+    kind = JOB_KINDS.get(job_submit.kind)
+    if kind is None:
+        raise HTTPException(status_code=422, detail=f"Unknown job kind, expected one of: {', '.join(JOB_KINDS)}")
+    try:
+        params = kind.params.model_validate(job_submit.params)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+    try:
+        job, created = await submit_job(session, job_submit.kind, params)
+    except Exception as e:
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    if created:
+        job_runner.enqueue(job.id)
+    elif job.status == JOB_DONE:
+        response.status_code = 200
+    return job
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: int, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    return await read_job(session, job_id)
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: int, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    """The stored result of a finished job; 409 while it is pending or running, or when it failed."""
+    job = await read_job(session, job_id)
+    if job.status != JOB_DONE:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return JSONBytesResponse(job.result.encode())
\ No newline at end of file
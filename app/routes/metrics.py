@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.database import built_engines
+from app.core.metrics import format_labels, render_metrics
+from app.core.pool import pool_status
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (metric name, pool_status key, type, help)
+POOL_METRICS = [
+    ("db_pool_checked_out", "checked_out", "gauge", "Connections currently checked out of the pool."),
+    ("db_pool_idle", "idle", "gauge", "Connections idle in the pool."),
+    ("db_pool_overflow", "overflow", "gauge", "Connections open beyond pool_size."),
+    ("db_pool_checkouts_total", "checkouts", "counter", "Connection checkouts."),
+    ("db_pool_timeouts_total", "timeouts", "counter", "Checkouts that timed out waiting for a connection."),
+    ("db_pool_wait_seconds_total", "total_wait_seconds", "counter", "Time spent waiting for a connection."),
+]
+
+def pool_metrics() -> list[str]:
+    pools = {label: pool_status(engine.pool) for label, engine in built_engines().items()}
+
+    lines = []
+    for name, key, kind, documentation in POOL_METRICS:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        lines += [f"{name}{format_labels(('engine',), (pool,))} {status[key]}" for pool, status in pools.items()]
+    return lines
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(render_metrics(pool_metrics()), media_type=PROMETHEUS_CONTENT_TYPE)
\ No newline at end of file
@@ -1,67 +1,216 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
-from sqlalchemy import func
-from sqlmodel import Session, and_, extract, select, update
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import delete, func
+from sqlmodel import and_, extract, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+import csv
 import urllib
 
-from app.models.attendance import Attendance
-from app.schemas.students import StudentProgressAverage
+from app.models.attendance import Attendance, AttendanceMonthly
+from app.schemas.students import DashboardStudent, StudentBulkDelete, StudentBulkDeleteResult, StudentImportResult, StudentProgressAverage, StudentProgressAverageByStudent, StudentSearchResult
+from app.services.cache_service import instructor_attendance_tag, instructor_students_tag, response_cache, student_progress_tag, student_tag
+from app.services.dashboard_service import dashboard_json, dashboard_statement
+from app.services.import_service import MAX_IMPORT_ROWS, import_students, parse_student_rows, validate_student_rows
 from app.services.jwt_service import token_verifier
+from app.services.pagination_service import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, stream_json_array
+from app.services.search_service import student_search
+from app.services.sync_service import SYNC_PROGRESS, SYNC_STUDENT, add_tombstones, move_student, next_sync_version, student_instructors, sync_stamp, tombstone_reassigned
+from app.services.serialization_service import JSONBytesResponse, rows_to_json, schema_columns, schema_fields
 from ..core.database import get_session
 from ..models.student import Student, StudentProgress
-from datetime import date as Date
+from datetime import date as Date, timedelta
+from typing import Optional
 
 router = APIRouter()
 
+STUDENT_FIELDS = schema_fields(Student)
+MAX_SEARCH_RESULTS = 100
+DASHBOARD_ATTENDANCE_DAYS = 30
+
+# Statements of the hot read routes, shared with scripts/explain_queries.py.
+
+def roster_statement(instructor_id: int):
+    return select(*schema_columns(Student)).where(Student.instructor_id == instructor_id).order_by(Student.id)
+
+def progress_dates_statement(instructor_id: int, student_id: int):
+    return select(StudentProgress.progress_date).join(
+        Student, Student.id == StudentProgress.student_id
+    ).where(and_(Student.instructor_id == instructor_id, Student.id == student_id)).distinct().order_by(StudentProgress.progress_date)
+
 @router.post(
     "/",
     response_model=Student
 )
-def create_student(student: Student, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def create_student(student: Student, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:
+        student.sqlmodel_update(sync_stamp(await next_sync_version(session, [student.instructor_id])))
         session.add(student)
-        session.commit()
-        session.refresh(student)
+        await session.commit()
+        await session.refresh(student)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+    await response_cache.invalidate(instructor_students_tag(student.instructor_id))
+    student_search.add(student)
     return student
 
-@router.get("/id/{student_id}", response_model=Student)
-def read_student_by_id(student_id: int, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
-    try:  
-        student = session.get(Student, student_id)
+@router.post("/import", response_model=StudentImportResult)
+async def import_students_bulk(
+    request: Request,
+    instructor_id: Optional[int] = Query(None, description="Instructor for rows that do not name one"),
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """
+    Onboards many students at once. The body is a JSON array of students or,
+    with `Content-Type: text/csv`, a CSV file whose header row names the
+    fields. Valid rows are inserted in one transaction; rows that fail
+    validation, name an unknown instructor or reuse an email or RUT are
+    listed in `rejected` with their 1-based row number and the reason.
+    """
+    try:
+        rows = parse_student_rows(await request.body(), request.headers.get("content-type", ""))
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=422, detail=f"Unreadable import: {e}")
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise HTTPException(status_code=413, detail=f"An import can hold at most {MAX_IMPORT_ROWS} students")
+
+    valid, rejected = validate_student_rows(rows, instructor_id)
+    try:
+        created, duplicates = await import_students(session, valid)
+        await session.commit()
     except Exception as e:
+        await session.rollback()
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+    await response_cache.invalidate(*(instructor_students_tag(instructor) for instructor in {student.instructor_id for _, student in created}))
+    student_search.add_rows((student.instructor_id, student_id, student.name, student.email, student.rut) for student_id, student in created)
+    return StudentImportResult(
+        message=f"Imported {len(created)} of {len(rows)} students",
+        created_ids=[student_id for student_id, _ in created],
+        rejected=sorted(rejected + duplicates, key=lambda reject: reject.row)
+    )
+
+@router.get("/search/{instructor_id}", response_model=list[StudentSearchResult])
+async def search_students(
+    instructor_id: int,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """
+    Searches an instructor's students by name, email and RUT, matching word
+    prefixes and tolerating typos. Results are ranked by `score` (1 for an
+    exact word, 0.9 for a prefix, lower for typo matches); no match returns an
+    empty list.
+    """
+    try:
+        hits = await student_search.search(session, instructor_id, q, limit)
+    except Exception as e:
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    return hits
+
+@router.get("/id/{student_id}", response_model=Student)
+async def read_student_by_id(student_id: int, request: Request, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    async def load(headers: dict):
+        try:  
+            student = await session.get(Student, student_id)
+        except Exception as e:
+            print(f"An error has ocurred: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+            
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
         
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-    
-    return student
+        return student
+
+    return await response_cache.respond(request, [student_tag(student_id)], load)
 
 @router.get("/{instructor_id}", response_model=list[Student])
-def read_students(instructor_id: int, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def read_students(
+    instructor_id: int,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """
+    Without `limit` the whole roster is returned. With `limit`, one page is
+    returned and the cursor of the next one is sent in the X-Next-Cursor
+    header. `stream=true` writes the rows as they are read from the database.
+    """
+    statement = roster_statement(instructor_id)
+    if cursor:
+        statement = statement.where(Student.id > decode_cursor(cursor))
+    if limit:
+        statement = statement.limit(limit)
+
+    if stream:
+        return StreamingResponse(
+            stream_json_array(statement, STUDENT_FIELDS, session.info.get("replica")),
+            media_type="application/json"
+        )
+
+    async def load(headers: dict):
+        try:
+            result = await session.exec(statement)
+            students = result.all()
+        except Exception as e:
+            print(f"An error has ocurred: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+        if not students:
+            raise HTTPException(status_code=404, detail="Students not found")
+
+        if limit and len(students) == limit:
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(students[-1].id)
+        
+        return rows_to_json(students, STUDENT_FIELDS)
+
+    return await response_cache.respond(request, [instructor_students_tag(instructor_id)], load)
+
+@router.get("/dashboard/{instructor_id}", response_model=list[DashboardStudent])
+async def read_dashboard(
+    instructor_id: int,
+    as_of: Optional[Date] = None,
+    session: AsyncSession = Depends(get_session),
+    dependencies = [Depends(token_verifier)]
+):
+    """
+    Everything the home screen shows for an instructor's students, in one
+    query: the profile, the latest progress entry, how each score changed
+    since the entry before it, and the attendance rate over the
+    DASHBOARD_ATTENDANCE_DAYS days ending on `as_of` (today by default).
+    Replaces read_students followed by per-student average and progress calls.
+    """
+    until = as_of or Date.today()
+    since = until - timedelta(days=DASHBOARD_ATTENDANCE_DAYS - 1)
     try:
-        statement = select(Student).where(Student.instructor_id == instructor_id)
-        result = session.exec(statement)
-        students = result.all()
+        result = await session.exec(dashboard_statement(instructor_id, since, until))
+        rows = result.all()
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-    if not students:
+    if not rows:
         raise HTTPException(status_code=404, detail="Students not found")
-    
-    return students
+
+    return JSONBytesResponse(dashboard_json(rows))
 
 @router.get("/email/{student_email}", response_model=Student)
-def read_student_by_email(student_email: str, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def read_student_by_email(student_email: str, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:
         student_email = urllib.parse.unquote(student_email)
 
         statement = select(Student).where(Student.email == student_email)
-        result = session.exec(statement)
+        result = await session.exec(statement)
         student = result.first()
     except Exception as e:
         print(f"An error has ocurred: {e}")
@@ -73,12 +222,12 @@ def read_student_by_email(student_email: str, session: Session = Depends(get_ses
     return student
 
 @router.get("/rut/{student_rut}", response_model=Student)
-def read_student_by_rut(student_rut: str, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def read_student_by_rut(student_rut: str, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:
         student_rut = urllib.parse.unquote(student_rut)
 
         statement = select(Student).where(Student.rut == student_rut)
-        result = session.exec(statement)
+        result = await session.exec(statement)
         student = result.first()
     except Exception as e:
         print(f"An error has ocurred: {e}")
@@ -90,9 +239,9 @@ def read_student_by_rut(student_rut: str, session: Session = Depends(get_session
     return student
 
 @router.put("/edit/id/{student_id}", response_model=Student)
-def update_student(student_id: int, student_update: Student, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def update_student(student_id: int, student_update: Student, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:
-        student = session.get(Student, student_id)
+        student = await session.get(Student, student_id)
     except Exception as e:
         print(f"An error has ocurred searching for the student: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -100,86 +249,135 @@ def update_student(student_id: int, student_update: Student, session: Session =
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
+    previous_instructor_id = student.instructor_id
     update_data = student_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(student, key, value)
 
     try:
+        # Before the first change: the ORM flushes pending changes on every query.
+        version = await next_sync_version(session, [previous_instructor_id, update_data.get("instructor_id", previous_instructor_id)])
+        for key, value in {**update_data, **sync_stamp(version)}.items():
+            setattr(student, key, value)
+        if student.instructor_id != previous_instructor_id:
+            await move_student(session, version, student_id, previous_instructor_id)
+
         session.add(student)
-        session.commit()
-        session.refresh(student)
+        await session.commit()
+        await session.refresh(student)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-        
+
+    await response_cache.invalidate(
+        student_tag(student_id),
+        instructor_students_tag(previous_instructor_id),
+        instructor_students_tag(student.instructor_id)
+    )
+    student_search.discard(previous_instructor_id, student_id)
+    student_search.add(student)
     return student
 
-@router.delete("/delete/id/{student_id}")
-def delete_student(student_id: int, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def delete_students_cascade(session: AsyncSession, student_ids: list[int]) -> tuple[list, list[int]]:
+    """
+    Deletes the students and every row that references them with one DELETE
+    per table, inside the caller's transaction, and tombstones the students
+    for delta sync. Returns (id, instructor_id) of the students that existed
+    and the instructors whose attendance was removed.
+    """
+    locked_instructor_ids = set((await student_instructors(session, student_ids)).values())
+    version = await next_sync_version(session, locked_instructor_ids)
+    attendance_instructor_ids = (await session.exec(
+        select(Attendance.instructor_id).where(Attendance.student_id.in_(student_ids)).distinct()
+    )).all()
+
+    await session.execute(delete(Attendance).where(Attendance.student_id.in_(student_ids)))
+    await session.execute(delete(AttendanceMonthly).where(AttendanceMonthly.student_id.in_(student_ids)))
+    await session.execute(delete(StudentProgress).where(StudentProgress.student_id.in_(student_ids)))
+    result = await session.execute(
+        delete(Student).where(Student.id.in_(student_ids)).returning(Student.id, Student.instructor_id)
+    )
+    students = result.all()
+    # A student moved to another instructor since the lookup needs that clock as well.
+    moved_to = {student.instructor_id for student in students} - locked_instructor_ids
+    if moved_to:
+        version = await next_sync_version(session, locked_instructor_ids | moved_to)
+    await add_tombstones(session, version, SYNC_STUDENT, [(student.instructor_id, student.id) for student in students])
+    return students, attendance_instructor_ids
+
+async def invalidate_deleted_students(students: list, attendance_instructor_ids: list[int]):
+    for student in students:
+        student_search.discard(student.instructor_id, student.id)
+    await response_cache.invalidate(
+        *{student_tag(student.id) for student in students},
+        *{student_progress_tag(student.id) for student in students},
+        *{instructor_students_tag(student.instructor_id) for student in students},
+        *{instructor_attendance_tag(instructor_id) for instructor_id in attendance_instructor_ids}
+    )
 
+@router.delete("/delete/id/{student_id}")
+async def delete_student(student_id: int, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:
-        statement = select(Attendance).where(Attendance.student_id == student_id)
-        result = session.exec(statement)
-        attendance = result.first()
-
-        if attendance:
-            session.delete(attendance)
-            session.commit()
+        students, attendance_instructor_ids = await delete_students_cascade(session, [student_id])
 
+        if not students:
+            await session.rollback()
+        else:
+            await session.commit()
     except Exception as e:
+        await session.rollback()
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-    try:
-        statement = select(StudentProgress).where(StudentProgress.student_id == student_id)
-        result = session.exec(statement)
-        student_progress = result.first()
-
-        if student_progress:
-            session.delete(student_progress)
-            session.commit()
+    if not students:
+        raise HTTPException(status_code=404, detail="Student not found")
 
-    except Exception as e:
-        print(f"An error has ocurred: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    await invalidate_deleted_students(students, attendance_instructor_ids)
+    return {"message": "Student deleted successfully"}
 
+@router.post("/delete/bulk", response_model=StudentBulkDeleteResult)
+async def delete_students(student_delete: StudentBulkDelete, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    """
+    Deletes many students, with their attendance and progress, in one
+    transaction. Ids that do not exist are skipped; `deleted_ids` lists the
+    students that were removed.
+    """
     try:
-        statement = select(Student).where(Student.id == student_id)
-        result = session.exec(statement)
-        student = result.first()
-
-        if not student:
-            raise HTTPException(status_code=404, detail="Student not found")
-        
-        session.delete(student)
-        session.commit()
-
-        return {"message": "Student deleted successfully"}
+        students, attendance_instructor_ids = await delete_students_cascade(session, student_delete.student_ids)
+        await session.commit()
     except Exception as e:
+        await session.rollback()
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+    await invalidate_deleted_students(students, attendance_instructor_ids)
+    return StudentBulkDeleteResult(message="Students deleted successfully", deleted_ids=sorted(student.id for student in students))
     
 @router.post(
     "/progress/"
 )
-def create_student_progress(student_progress: StudentProgress, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def create_student_progress(student_progress: StudentProgress, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     student_progress.id = None
+    # Table models arrive unvalidated; the async driver needs real date objects.
+    student_progress = StudentProgress.model_validate(student_progress, from_attributes=True)
     try:
+        instructors = await student_instructors(session, [student_progress.student_id])
+        student_progress.sqlmodel_update(sync_stamp(await next_sync_version(session, instructors.values())))
         session.add(student_progress)
-        session.commit()
-        session.refresh(student_progress)
+        await session.commit()
+        await session.refresh(student_progress)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+    await response_cache.invalidate(student_progress_tag(student_progress.student_id))
     return {"message": "Student progress created successfully"}
 
 @router.get("/progress/student/{student_id}/{date}", response_model=StudentProgress)
-def read_student_progress(student_id: int, date: Date, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def read_student_progress(student_id: int, date: Date, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try: 
         statement = select(StudentProgress).where(
             and_(StudentProgress.student_id == student_id, StudentProgress.progress_date == date)
         )
-        result = session.exec(statement).first()
+        result = (await session.exec(statement)).first()
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -192,14 +390,14 @@ def read_student_progress(student_id: int, date: Date, session: Session = Depend
     return student_progress
 
 @router.get("/progress/student-avg/{student_id}/{month}", response_model=StudentProgressAverage)
-def read_student_progress_average(student_id: int, month: int, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def read_student_progress_average(student_id: int, month: int, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try: 
         if month != 0:
             pre_statement = select(StudentProgress).where(and_(StudentProgress.student_id == student_id, extract("month", StudentProgress.progress_date) == month))
         else:
             pre_statement = select(StudentProgress).where(StudentProgress.student_id == student_id)
 
-        pre_result = session.exec(pre_statement).first()
+        pre_result = (await session.exec(pre_statement)).first()
 
         if not pre_result:
             result = StudentProgressAverage(
@@ -229,7 +427,7 @@ def read_student_progress_average(student_id: int, month: int, session: Session
                 .where(StudentProgress.student_id == student_id)
             )
         
-        result = session.exec(statement).first()
+        result = (await session.exec(statement)).first()
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -241,10 +439,43 @@ def read_student_progress_average(student_id: int, month: int, session: Session
 
     return student_progress
 
+@router.get("/progress/instructor-avg/{instructor_id}/{month}", response_model=list[StudentProgressAverageByStudent])
+async def read_instructor_progress_averages(instructor_id: int, month: int, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    """
+    Progress averages of every student of an instructor in one GROUP BY.
+    Students without progress in the period get 0, like the per-student route.
+    """
+    try:
+        join_condition = StudentProgress.student_id == Student.id
+        if month != 0:
+            join_condition = and_(join_condition, extract("month", StudentProgress.progress_date) == month)
+
+        statement = (
+            select(
+                Student.id.label("student_id"),
+                func.coalesce(func.avg(StudentProgress.technique), 0).label("technique_avg"),
+                func.coalesce(func.avg(StudentProgress.physique), 0).label("physique_avg"),
+                func.coalesce(func.avg(StudentProgress.combat_iq), 0).label("combat_iq_avg")
+            )
+            .outerjoin(StudentProgress, join_condition)
+            .where(Student.instructor_id == instructor_id)
+            .group_by(Student.id)
+            .order_by(Student.id)
+        )
+        results = (await session.exec(statement)).all()
+    except Exception as e:
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    if not results:
+        raise HTTPException(status_code=404, detail="Students not found")
+
+    return results
+
 @router.put("/progress/{student_progress_id}", response_model=StudentProgress)
-def update_student_progress(student_progress_id: int, student_progress_update: StudentProgress, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def update_student_progress(student_progress_id: int, student_progress_update: StudentProgress, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:
-        student_progress = session.get(StudentProgress, student_progress_id)
+        student_progress = await session.get(StudentProgress, student_progress_id)
     except Exception as e:
         print(f"An error has ocurred searching for the student progress: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -252,34 +483,44 @@ def update_student_progress(student_progress_id: int, student_progress_update: S
     if not student_progress:
         raise HTTPException(status_code=404, detail="Student progress not found")
 
+    previous_student_id = student_progress.student_id
     update_data = student_progress_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(student_progress, key, value)
+    update_data = StudentProgress.model_validate({**student_progress.model_dump(), **update_data}).model_dump(include=update_data.keys())
 
     try:
+        student_id = update_data.get("student_id", previous_student_id)
+        instructors = await student_instructors(session, [previous_student_id, student_id])
+        version = await next_sync_version(session, instructors.values())
+        for key, value in {**update_data, **sync_stamp(version)}.items():
+            setattr(student_progress, key, value)
+        if student_id != previous_student_id:
+            await tombstone_reassigned(session, version, SYNC_PROGRESS, {student_progress_id: (previous_student_id, student_id)}, instructors)
+
         session.add(student_progress)
-        session.commit()
-        session.refresh(student_progress)
+        await session.commit()
+        await session.refresh(student_progress)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-        
+
+    await response_cache.invalidate(student_progress_tag(previous_student_id), student_progress_tag(student_progress.student_id))
     return student_progress
 
 @router.get("/progress/dates/{instructor_id}/{student_id}", response_model=list[Date])
-def get_progress_dates(instructor_id: int, student_id: int, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
-    try: 
-        statement = select(StudentProgress.progress_date).join(
-            Student, Student.id == StudentProgress.student_id
-        ).where(and_(Student.instructor_id == instructor_id, Student.id == student_id)).distinct().order_by(StudentProgress.progress_date)
-        results = session.exec(statement).all()
-    except Exception as e:
-        print(f"An error has ocurred: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+async def get_progress_dates(instructor_id: int, student_id: int, request: Request, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    async def load(headers: dict):
+        try: 
+            results = (await session.exec(progress_dates_statement(instructor_id, student_id))).all()
+        except Exception as e:
+            print(f"An error has ocurred: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+            
+        if not results:
+            raise HTTPException(status_code=404, detail="Student progress dates not found")
         
-    if not results:
-        raise HTTPException(status_code=404, detail="Student progress dates not found")
-    
-    dates = results
+        dates = results
+
+        return dates
 
-    return dates
\ No newline at end of file
+    # Tagged with the student too: moving the student to another instructor changes the answer.
+    return await response_cache.respond(request, [student_progress_tag(student_id), student_tag(student_id)], load)
\ No newline at end of file
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional
+
+from app.schemas.sync import SyncChanges
+from app.services.jwt_service import token_verifier
+from app.services.serialization_service import JSONBytesResponse
+from app.services.sync_service import changes_since, decode_sync_token
+from ..core.database import get_session
+
+router = APIRouter()
+
+@router.get("/{instructor_id}", response_model=SyncChanges)
+async def sync_changes(instructor_id: int, since: Optional[str] = None, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
+    """
+    Delta sync for the offline client. Without `since`, every student of the
+    instructor with their attendance and progress; with the `token` of the
+    previous response, only the rows written since then and, in `deleted`,
+    the ids that left the instructor's scope. Rows and tombstones carry their
+    version and are applied in version order; a deleted student takes its
+    attendance and progress with it.
+    """
+    version = decode_sync_token(since, instructor_id) if since is not None else None
+    try:
+        changes = await changes_since(session, instructor_id, version)
+    except Exception as e:
+        print(f"An error has ocurred: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    return JSONBytesResponse(changes)
\ No newline at end of file
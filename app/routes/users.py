@@ -1,20 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..core.database import get_session
 from ..models.user import User
 from ..schemas.user import UserDataSchema, UserResponseSchema, UserCredentialsSchema
-from ..services.password_service import hash_password, verify_password 
+from ..core.config import PASSWORD_RETRY_AFTER
+from ..services.password_service import PasswordPoolBusy, hash_password_async, verify_and_update_password_async
 from ..services.jwt_service import create_access_token, create_refresh_token, token_verifier
 import urllib.parse
 
 router = APIRouter()
 
+def password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many password operations in progress, try again shortly.",
+        headers={"Retry-After": str(PASSWORD_RETRY_AFTER)},
+    )
+
 @router.post("/")
-def create_user(user: User, session: Session = Depends(get_session)):
+async def create_user(user: User, session: AsyncSession = Depends(get_session)):
     try:
         statement = select(User).where(User.email == user.email)
-        result = session.exec(statement)
+        result = await session.exec(statement)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -23,19 +32,23 @@ def create_user(user: User, session: Session = Depends(get_session)):
         raise HTTPException(status_code=409, detail="Email is already in use.")
 
     try:
-        user.password = hash_password(user.password)
+        user.password = await hash_password_async(user.password)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+
+    try:
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        await session.commit()
+        await session.refresh(user)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
     return {"message": "User created."}
 
 @router.get("/id/{user_id}", response_model=UserResponseSchema)
-def read_user_by_id(user_id: int, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def read_user_by_id(user_id: int, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:  
-        user = session.get(User, user_id)
+        user = await session.get(User, user_id)
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -46,12 +59,12 @@ def read_user_by_id(user_id: int, session: Session = Depends(get_session), depen
     return user
 
 @router.get("/email/{user_email}", response_model=UserDataSchema)
-def read_user_by_email(user_email: str, session: Session = Depends(get_session), dependencies = [Depends(token_verifier)]):
+async def read_user_by_email(user_email: str, session: AsyncSession = Depends(get_session), dependencies = [Depends(token_verifier)]):
     try:
         user_email = urllib.parse.unquote(user_email)
 
         statement = select(User).where(User.email == user_email)
-        result = session.exec(statement)
+        result = await session.exec(statement)
         user = result.first()
     except Exception as e:
         print(f"An error has ocurred: {e}")
@@ -63,18 +76,36 @@ def read_user_by_email(user_email: str, session: Session = Depends(get_session),
     return user
 
 @router.post("/login/", response_model=UserResponseSchema)
-def login(user_credentials: UserCredentialsSchema, session: Session = Depends(get_session)):
+async def login(user_credentials: UserCredentialsSchema, session: AsyncSession = Depends(get_session)):
     try:
         statement = select(User).where(User.email == user_credentials.email)
-        result = session.exec(statement)
+        result = await session.exec(statement)
         user = result.first()
     except Exception as e:
         print(f"An error has ocurred: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-    if not user or not verify_password(user_credentials.password, user.password):
+    if not user:
+        raise HTTPException(status_code=401, detail="Wrong credetials.")
+
+    try:
+        valid, new_hash = await verify_and_update_password_async(user_credentials.password, user.password)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+
+    if not valid:
         raise HTTPException(status_code=401, detail="Wrong credetials.")
 
+    # The stored hash uses an outdated bcrypt cost; upgrade it while we have the plain password.
+    if new_hash:
+        try:
+            user.password = new_hash
+            session.add(user)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            print(f"An error has ocurred rehashing the password: {e}")
+
     # Generate token
     access_token = create_access_token({"sub": user.email})
     #refresh_token = create_refresh_token({"sub": user.email})
@@ -91,5 +122,5 @@ def login(user_credentials: UserCredentialsSchema, session: Session = Depends(ge
     return user
 
 @router.get("/verify-token/")
-def verify_token(dependencies = Depends(token_verifier)):
+async def verify_token(dependencies = Depends(token_verifier)):
     return {'email': dependencies["sub"]}
\ No newline at end of file
@@ -1,7 +1,13 @@
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, Field
 from typing import Optional
 from datetime import date as Date
 
+class AttendanceCreate(SQLModel, table=False):
+    instructor_id: int
+    student_id: int
+    date: Date
+    present: bool
+
 class AttendanceResponse(SQLModel, table=False):
     id: int
     instructor_id: int 
@@ -13,3 +19,47 @@ class AttendanceResponse(SQLModel, table=False):
 class AttendanceAvg(SQLModel, table=False):
     student_id: int
     avg_attendance: float
+
+class AttendanceBulkResult(SQLModel, table=False):
+    message: str
+    ids: list[int]
+
+class AttendanceBulkDeleteResult(SQLModel, table=False):
+    message: str
+    deleted: int
+
+class AttendanceMatrixStudent(SQLModel, table=False):
+    student_id: int
+    student_name: str
+    cells: str
+    present: int
+    recorded: int
+    rate: float
+    current_streak: int
+    longest_streak: int
+
+class AttendanceMatrixResponse(SQLModel, table=False):
+    instructor_id: int
+    start: Date
+    end: Date
+    dates: list[Date]
+    date_rates: list[float]
+    students: list[AttendanceMatrixStudent]
+
+
+class ClassSessionStudent(SQLModel, table=False):
+    student_id: int
+    present: bool
+    technique: Optional[int] = None
+    physique: Optional[int] = None
+    combat_iq: Optional[int] = None
+
+class ClassSession(SQLModel, table=False):
+    instructor_id: int
+    date: Date
+    students: list[ClassSessionStudent] = Field(min_length=1, max_length=1000)
+
+class ClassSessionResult(SQLModel, table=False):
+    message: str
+    attendance_ids: list[int]
+    progress_ids: list[int]
\ No newline at end of file
@@ -0,0 +1,28 @@
+from pydantic import model_validator
+from sqlmodel import SQLModel
+from typing import Optional
+from datetime import date as Date, datetime
+
+class JobSubmit(SQLModel, table=False):
+    kind: str
+    params: dict
+
+class JobStatus(SQLModel, table=False):
+    id: int
+    kind: str
+    status: str
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+class InstructorReportParams(SQLModel, table=False):
+    instructor_id: int
+    start: Date
+    end: Date
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.start > self.end:
+            raise ValueError("start must not be after end")
+        return self
\ No newline at end of file
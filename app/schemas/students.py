@@ -5,4 +5,71 @@ from datetime import date
 class StudentProgressAverage(SQLModel, table=False):
     technique_avg: float
     physique_avg: float
-    combat_iq_avg: float
\ No newline at end of file
+    combat_iq_avg: float
+
+class StudentProgressAverageByStudent(StudentProgressAverage, table=False):
+    student_id: int
+
+class StudentBulkDelete(SQLModel, table=False):
+    student_ids: list[int] = Field(min_length=1, max_length=10000)
+
+class StudentBulkDeleteResult(SQLModel, table=False):
+    message: str
+    deleted_ids: list[int]
+
+class StudentSearchResult(SQLModel, table=False):
+    id: int
+    name: str
+    email: str
+    rut: str
+    score: float
+
+class StudentImport(SQLModel, table=False):
+    instructor_id: int
+    name: str = Field(min_length=1)
+    email: str = Field(min_length=1)
+    rut: str = Field(min_length=1)
+    sex: str
+    age: Optional[int] = None
+    weight: Optional[float] = None
+    height: Optional[float] = None
+
+class StudentImportReject(SQLModel, table=False):
+    row: int
+    email: Optional[str]
+    rut: Optional[str]
+    reason: str
+
+class StudentImportResult(SQLModel, table=False):
+    message: str
+    created_ids: list[int]
+    rejected: list[StudentImportReject]
+
+class DashboardProgress(SQLModel, table=False):
+    progress_date: date
+    technique: Optional[int]
+    physique: Optional[int]
+    combat_iq: Optional[int]
+
+class DashboardProgressDelta(SQLModel, table=False):
+    technique: Optional[int]
+    physique: Optional[int]
+    combat_iq: Optional[int]
+
+class DashboardAttendance(SQLModel, table=False):
+    present: int
+    total: int
+    rate: float
+
+class DashboardStudent(SQLModel, table=False):
+    id: int
+    name: str
+    email: str
+    rut: str
+    sex: str
+    age: Optional[int]
+    weight: Optional[float]
+    height: Optional[float]
+    latest_progress: Optional[DashboardProgress]
+    progress_delta: Optional[DashboardProgressDelta]
+    attendance: DashboardAttendance
\ No newline at end of file
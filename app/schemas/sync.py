@@ -0,0 +1,20 @@
+from sqlmodel import SQLModel
+
+from app.models.attendance import Attendance
+from app.models.student import Student, StudentProgress
+
+class SyncDeletedRow(SQLModel, table=False):
+    id: int
+    version: int
+
+class SyncDeleted(SQLModel, table=False):
+    students: list[SyncDeletedRow]
+    attendance: list[SyncDeletedRow]
+    progress: list[SyncDeletedRow]
+
+class SyncChanges(SQLModel, table=False):
+    token: str
+    students: list[Student]
+    attendance: list[Attendance]
+    progress: list[StudentProgress]
+    deleted: SyncDeleted
\ No newline at end of file
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from ..core.config import CACHE_BACKEND, CACHE_MAX_ENTRIES, CACHE_TTL, REDIS_URL, REPLICA_READ_YOUR_WRITES_SECONDS
+
+@dataclass
+class CachedResponse:
+    etag: str
+    body: bytes
+    headers: dict = field(default_factory=dict)
+
+class CacheBackend(ABC):
+    """Storage for cached responses. Entries are tagged so writes can drop them by instructor or student."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    @abstractmethod
+    async def set(self, key: str, entry: CachedResponse, tags: Iterable[str], ttl: float): ...
+
+    @abstractmethod
+    async def invalidate(self, tags: Iterable[str]): ...
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU with TTL. Invalidations only reach the worker that made the write."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CachedResponse, tuple[str, ...]]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, entry, _ = item
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse, tags: Iterable[str], ttl: float):
+        self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, entry, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]):
+        for tag in tags:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+
+    def _remove(self, key: str):
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        for tag in item[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend for multi-worker deployments. Eviction is left to the
+    server, so configure Redis with an LRU maxmemory-policy.
+    """
+
+    prefix = "sportview:cache:"
+
+    def __init__(self, url: str):
+        from redis import asyncio as redis
+
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        data = await self.client.get(self.prefix + key)
+        if data is None:
+            return None
+        data = json.loads(data)
+        return CachedResponse(etag=data["etag"], body=data["body"].encode(), headers=data["headers"])
+
+    async def set(self, key: str, entry: CachedResponse, tags: Iterable[str], ttl: float):
+        data = json.dumps({"etag": entry.etag, "body": entry.body.decode(), "headers": entry.headers})
+        async with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.set(self.prefix + key, data, ex=int(ttl))
+            for tag in tags:
+                pipeline.sadd(self.prefix + "tag:" + tag, key)
+                pipeline.expire(self.prefix + "tag:" + tag, int(ttl))
+            await pipeline.execute()
+
+    async def invalidate(self, tags: Iterable[str]):
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            keys = await self.client.smembers(tag_key)
+            await self.client.delete(tag_key, *(self.prefix + key.decode() for key in keys))
+
+def instructor_students_tag(instructor_id: int) -> str:
+    return f"instructor:{instructor_id}:students"
+
+def instructor_attendance_tag(instructor_id: int) -> str:
+    return f"instructor:{instructor_id}:attendance"
+
+def student_tag(student_id: int) -> str:
+    return f"student:{student_id}"
+
+def student_progress_tag(student_id: int) -> str:
+    return f"student:{student_id}:progress"
+
+class ResponseCache:
+    """
+    Caches the JSON body of read-mostly GET routes under their path and query
+    string, and answers If-None-Match with 304 when the ETag still matches.
+
+    Responses read from a replica are cached apart from those read from the
+    primary and live at most `replica_ttl`: a lagging replica can still return
+    rows a write has just invalidated, and those must not reach clients that
+    read from the primary to see their own writes.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, replica_ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.replica_ttl = min(ttl, replica_ttl)
+
+    @staticmethod
+    def key(request: Request) -> str:
+        return request.url.path + "?" + "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items()))
+
+    async def respond(self, request: Request, tags: Iterable[str], build: Callable[[dict], Awaitable[object]]) -> Response:
+        """
+        Serves the cached entry for `request`, or awaits `build(headers)` and
+        caches its JSON-encoded result; `build` may also return JSON bytes
+        directly. It may add response headers to the dict it receives, and
+        HTTPExceptions it raises are not cached.
+        """
+        key, ttl = self.key(request), self.ttl
+        # Set by get_session to the replica the request's session reads from.
+        if getattr(request.state, "replica", None) is not None:
+            key, ttl = "replica:" + key, self.replica_ttl
+        entry = await self.backend.get(key)
+
+        if entry is None:
+            headers = {}
+            content = await build(headers)
+            body = content if isinstance(content, bytes) else orjson.dumps(jsonable_encoder(content))
+            entry = CachedResponse(etag=f'"{hashlib.sha1(body).hexdigest()}"', body=body, headers=headers)
+            await self.backend.set(key, entry, tags, ttl)
+
+        headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+        if entry.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, *tags: str):
+        await self.backend.invalidate(tags)
+
+def build_backend() -> CacheBackend:
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend(REDIS_URL)
+    return MemoryCacheBackend(CACHE_MAX_ENTRIES)
+
+# The read-your-writes window doubles as the bound on replication lag.
+response_cache = ResponseCache(build_backend(), CACHE_TTL, REPLICA_READ_YOUR_WRITES_SECONDS)
\ No newline at end of file
@@ -0,0 +1,83 @@
+from datetime import date as Date
+from typing import Iterable
+
+import orjson
+from sqlalchemy import Integer, cast, func
+from sqlmodel import and_, select
+
+from ..models.attendance import Attendance
+from ..models.student import Student, StudentProgress
+
+# Scores compared between a student's latest progress entry and the one before it.
+PROGRESS_SCORES = ("technique", "physique", "combat_iq")
+PROFILE_FIELDS = ("id", "name", "email", "rut", "sex", "age", "weight", "height")
+
+def dashboard_statement(instructor_id: int, since: Date, until: Date):
+    """
+    One statement for the whole dashboard. The roster is left-joined to its
+    progress and ranked per student newest first with row_number(); lag()
+    pairs each entry with the scores of the one before it, so the top-ranked
+    row carries the latest entry and its deltas (a student without progress
+    keeps a single row of nulls). Attendance between `since` and `until` is
+    counted per student and left-joined to that.
+    """
+    history = (StudentProgress.progress_date, StudentProgress.id)
+    ranked = (
+        select(
+            *(getattr(Student, field) for field in PROFILE_FIELDS),
+            StudentProgress.progress_date,
+            *(getattr(StudentProgress, score) for score in PROGRESS_SCORES),
+            *(
+                func.lag(getattr(StudentProgress, score)).over(partition_by=Student.id, order_by=history).label(f"previous_{score}")
+                for score in PROGRESS_SCORES
+            ),
+            func.row_number().over(partition_by=Student.id, order_by=[column.desc() for column in history]).label("position"),
+        )
+        .outerjoin(StudentProgress, StudentProgress.student_id == Student.id)
+        .where(Student.instructor_id == instructor_id)
+        .subquery()
+    )
+    attendance = (
+        select(Attendance.student_id, func.sum(cast(Attendance.present, Integer)).label("present"), func.count().label("total"))
+        .join(Student, Attendance.student_id == Student.id)
+        .where(and_(Student.instructor_id == instructor_id, Attendance.date >= since, Attendance.date <= until))
+        .group_by(Attendance.student_id)
+        .subquery()
+    )
+    return (
+        select(
+            *(ranked.c[field] for field in PROFILE_FIELDS),
+            ranked.c.progress_date,
+            *(ranked.c[score] for score in PROGRESS_SCORES),
+            *(ranked.c[score] - ranked.c[f"previous_{score}"] for score in PROGRESS_SCORES),
+            func.coalesce(attendance.c.present, 0),
+            func.coalesce(attendance.c.total, 0),
+        )
+        .outerjoin(attendance, attendance.c.student_id == ranked.c.id)
+        .where(ranked.c.position == 1)
+        .order_by(ranked.c.id)
+    )
+
+def dashboard_json(rows: Iterable) -> bytes:
+    """
+    Encodes rows of `dashboard_statement` as DashboardStudent objects.
+    `progress_delta` is null until a student has two progress entries.
+    """
+    profile_end = len(PROFILE_FIELDS)
+    scores_end = profile_end + 1 + len(PROGRESS_SCORES)
+    deltas_end = scores_end + len(PROGRESS_SCORES)
+
+    students = []
+    for row in rows:
+        student = dict(zip(PROFILE_FIELDS, row[:profile_end]))
+        progress_date = row[profile_end]
+        deltas = row[scores_end:deltas_end]
+        present, total = row[deltas_end:]
+        student["latest_progress"] = (
+            {"progress_date": progress_date, **dict(zip(PROGRESS_SCORES, row[profile_end + 1:scores_end]))}
+            if progress_date is not None else None
+        )
+        student["progress_delta"] = dict(zip(PROGRESS_SCORES, deltas)) if any(delta is not None for delta in deltas) else None
+        student["attendance"] = {"present": present, "total": total, "rate": present / total if total else 0}
+        students.append(student)
+    return orjson.dumps(students, option=orjson.OPT_UTC_Z)
\ No newline at end of file
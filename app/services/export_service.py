@@ -0,0 +1,94 @@
+import csv
+import importlib.util
+import io
+from typing import AsyncIterator, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+
+from ..core.database import session_scope, stream_partitions
+
+EXPORT_BATCH_SIZE = 5000
+
+CSV_MEDIA_TYPE = "text/csv"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+async def export_partitions(statement, replica: Optional[int]) -> AsyncIterator[list]:
+    """
+    Rows of `statement` in lists of EXPORT_BATCH_SIZE from a server-side
+    cursor, on a session of their own since exports are read after the
+    handler has returned.
+    """
+    async with session_scope(replica) as session:
+        async for partition in stream_partitions(session, statement, EXPORT_BATCH_SIZE):
+            yield partition
+
+async def stream_csv(statement, header: Sequence[str], replica: Optional[int] = None):
+    """Writes the header before running the query, then one chunk of CSV per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(header)
+    yield buffer.getvalue().encode()
+
+    async for partition in export_partitions(statement, replica):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(partition)
+        yield buffer.getvalue().encode()
+
+class ParquetSink:
+    """
+    Output file for ParquetWriter that hands written bytes back to the
+    response instead of keeping them. Tracks the position itself because the
+    footer records absolute offsets of the row groups.
+    """
+
+    def __init__(self):
+        self.position = 0
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+async def stream_parquet(statement, columns: Sequence[tuple], replica: Optional[int] = None):
+    """
+    Writes one Parquet row group per batch of rows. `columns` is the name and
+    Arrow type name (`int64`, `string`, `date32`, ...) of every selected
+    column, in order. Requires pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in columns])
+    sink = ParquetSink()
+    writer = pq.ParquetWriter(sink, schema)
+    yield sink.drain()
+
+    try:
+        async for partition in export_partitions(statement, replica):
+            table = pa.Table.from_arrays([pa.array(values, type=field.type) for values, field in zip(zip(*partition), schema)], schema=schema)
+            await run_in_threadpool(writer.write_table, table)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
\ No newline at end of file
@@ -0,0 +1,97 @@
+import csv
+import io
+from typing import Optional
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlmodel import or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.student import Student
+from ..models.user import User
+from ..schemas.students import StudentImport, StudentImportReject
+from .sync_service import next_sync_version, sync_stamp
+
+MAX_IMPORT_ROWS = 10000
+
+def parse_student_rows(body: bytes, content_type: str) -> list[dict]:
+    """
+    The submitted students as dicts: a JSON array of objects, or CSV with a
+    header row of field names when `content_type` is text/csv. Empty CSV
+    cells become null. Raises ValueError when the body has neither shape.
+    """
+    if content_type.startswith("text/csv"):
+        reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+        return [{name: value if value != "" else None for name, value in row.items() if name} for row in reader]
+
+    rows = orjson.loads(body)
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Expected a JSON array of students")
+    return rows
+
+def validate_student_rows(rows: list[dict], instructor_id: Optional[int]) -> tuple[list[tuple[int, StudentImport]], list[StudentImportReject]]:
+    """Validates each row on its own, so one bad row rejects only itself. Rows are numbered from 1."""
+    valid, rejected = [], []
+    for number, row in enumerate(rows, start=1):
+        if instructor_id is not None and row.get("instructor_id") is None:
+            row = {**row, "instructor_id": instructor_id}
+        try:
+            valid.append((number, StudentImport.model_validate(row)))
+        except ValidationError as e:
+            reason = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors(include_url=False))
+            rejected.append(StudentImportReject(row=number, email=row.get("email"), rut=row.get("rut"), reason=reason))
+    return valid, rejected
+
+async def import_students(session: AsyncSession, rows: list[tuple[int, StudentImport]]) -> tuple[list[tuple[int, StudentImport]], list[StudentImportReject]]:
+    """
+    Rejects rows whose instructor does not exist or whose email or RUT is
+    already taken, by an existing student (one query over the email and RUT
+    indexes) or by an earlier row of the batch, and inserts the rest with one
+    multi-row INSERT inside the caller's transaction. Returns the inserted
+    rows paired with their new ids, matched back on the email, which is
+    unique among the accepted rows, and the rejects.
+    """
+    if not rows:
+        return [], []
+
+    emails = {student.email for _, student in rows}
+    ruts = {student.rut for _, student in rows}
+    instructor_ids = {student.instructor_id for _, student in rows}
+    existing = (await session.exec(
+        select(Student.email, Student.rut).where(or_(Student.email.in_(emails), Student.rut.in_(ruts)))
+    )).all()
+    known_instructors = set((await session.exec(select(User.id).where(User.id.in_(instructor_ids)))).all())
+    taken_emails = {email for email, _ in existing}
+    taken_ruts = {rut for _, rut in existing}
+
+    accepted, rejected = [], []
+    seen_emails, seen_ruts = set(), set()
+    for number, student in rows:
+        reasons = []
+        if student.instructor_id not in known_instructors:
+            reasons.append("instructor not found")
+        if student.email in taken_emails:
+            reasons.append("email already exists")
+        elif student.email in seen_emails:
+            reasons.append("email repeated in the import")
+        if student.rut in taken_ruts:
+            reasons.append("rut already exists")
+        elif student.rut in seen_ruts:
+            reasons.append("rut repeated in the import")
+
+        if reasons:
+            rejected.append(StudentImportReject(row=number, email=student.email, rut=student.rut, reason="; ".join(reasons)))
+        else:
+            accepted.append(student)
+        seen_emails.add(student.email)
+        seen_ruts.add(student.rut)
+
+    if not accepted:
+        return [], rejected
+
+    stamp = sync_stamp(await next_sync_version(session, {student.instructor_id for student in accepted}))
+    statement = insert(Student).returning(Student.id, Student.email)
+    result = await session.execute(statement, [{**student.model_dump(), **stamp} for student in accepted])
+    ids = {email: student_id for student_id, email in result}
+    return [(ids[student.email], student) for student in accepted], rejected
\ No newline at end of file
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+import orjson
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel, and_, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import JOB_POLL_INTERVAL, JOB_REQUEUE_GRACE, JOB_RESULT_TTL, JOB_TIMEOUT, JOB_WORKERS
+from ..core.database import session_scope
+from ..core.replicas import replica_health
+from ..models.job import JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_RUNNING, Job
+from ..schemas.jobs import InstructorReportParams
+from .report_service import instructor_report
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class JobKind:
+    params: type[SQLModel]
+    run: Callable[[AsyncSession, SQLModel], Awaitable[dict]]
+
+JOB_KINDS = {
+    "instructor_report": JobKind(InstructorReportParams, instructor_report),
+}
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def job_key(kind: str, params: SQLModel) -> str:
+    """Same kind and parameters, same key, whatever the order of the submitted fields."""
+    canonical = json.dumps(params.model_dump(mode="json"), sort_keys=True)
+    return hashlib.sha256(f"{kind}:{canonical}".encode()).hexdigest()
+
+async def find_reusable_job(session: AsyncSession, key: str) -> Optional[Job]:
+    """The pending or running job for `key`, or one that finished less than JOB_RESULT_TTL ago."""
+    statement = (
+        select(Job)
+        .where(and_(
+            Job.key == key,
+            or_(
+                Job.status.in_([JOB_PENDING, JOB_RUNNING]),
+                and_(Job.status == JOB_DONE, Job.finished_at >= utcnow() - timedelta(seconds=JOB_RESULT_TTL))
+            )
+        ))
+        .order_by(Job.id.desc())
+        .limit(1)
+    )
+    return (await session.exec(statement)).first()
+
+async def submit_job(session: AsyncSession, kind: str, params: SQLModel) -> tuple[Job, bool]:
+    """
+    Returns the job computing `params` and whether it was created by this call.
+    Identical pending jobs and recent results are reused; two workers racing
+    to create the same job are settled by the partial unique index on key.
+    """
+    key = job_key(kind, params)
+    job = await find_reusable_job(session, key)
+    if job is not None:
+        return job, False
+
+    job = Job(kind=kind, key=key, params=params.model_dump_json(), created_at=utcnow())
+    try:
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+        return job, True
+    except IntegrityError:
+        await session.rollback()
+        return await find_reusable_job(session, key), False
+
+class JobRunner:
+    """
+    JOB_WORKERS tasks in this process that run jobs submitted here right away
+    and poll the job table every JOB_POLL_INTERVAL seconds for jobs left by
+    other workers or by a restart. A job is claimed with a conditional UPDATE,
+    so each one runs once even with several processes polling.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.queue: asyncio.Queue[int] = asyncio.Queue()
+        self.queued: set[int] = set()
+        self.tasks: list[asyncio.Task] = []
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self.work()) for _ in range(self.workers)]
+        if self.tasks:
+            self.tasks.append(asyncio.create_task(self.poll()))
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def enqueue(self, job_id: int):
+        if self.tasks and job_id not in self.queued:
+            self.queued.add(job_id)
+            self.queue.put_nowait(job_id)
+
+    async def poll(self):
+        while True:
+            try:
+                await self.requeue_stale_jobs()
+                async with session_scope() as session:
+                    pending = (await session.exec(select(Job.id).where(Job.status == JOB_PENDING).order_by(Job.id))).all()
+                for job_id in pending:
+                    self.enqueue(job_id)
+            except Exception as e:
+                logger.warning("Polling the job table failed: %s", e)
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+    async def requeue_stale_jobs(self):
+        """
+        Jobs still running JOB_REQUEUE_GRACE seconds after JOB_TIMEOUT were
+        left by a worker that died; run them again. The grace leaves a live
+        worker whose job just timed out the time to record the failure.
+        """
+        async with session_scope() as session:
+            await session.execute(
+                update(Job)
+                .where(and_(Job.status == JOB_RUNNING, Job.started_at < utcnow() - timedelta(seconds=JOB_TIMEOUT + JOB_REQUEUE_GRACE)))
+                .values(status=JOB_PENDING, started_at=None)
+            )
+            await session.commit()
+
+    async def work(self):
+        while True:
+            job_id = await self.queue.get()
+            self.queued.discard(job_id)
+            try:
+                await self.run(job_id)
+            except Exception as e:
+                logger.exception("Job %s could not be run: %s", job_id, e)
+
+    async def claim(self, job_id: int) -> Optional[Job]:
+        """
+        Marks the job running if it is still pending. The returned job's
+        `started_at` identifies this claim when the outcome is recorded.
+        """
+        async with session_scope() as session:
+            result = await session.execute(
+                update(Job).where(and_(Job.id == job_id, Job.status == JOB_PENDING)).values(status=JOB_RUNNING, started_at=utcnow())
+            )
+            await session.commit()
+            if result.rowcount != 1:
+                return None
+            return await session.get(Job, job_id)
+
+    async def run(self, job_id: int):
+        job = await self.claim(job_id)
+        if job is None:
+            return
+
+        kind = JOB_KINDS[job.kind]
+        try:
+            # Reports only read, so they can run on a replica.
+            async with session_scope(replica_health.pick()) as session:
+                result = await asyncio.wait_for(kind.run(session, kind.params.model_validate_json(job.params)), JOB_TIMEOUT)
+            values = {"status": JOB_DONE, "result": orjson.dumps(result).decode()}
+        except asyncio.TimeoutError:
+            logger.warning("Job %s (%s) timed out", job_id, job.kind)
+            values = {"status": JOB_FAILED, "error": f"Timed out after {JOB_TIMEOUT:g} seconds"}
+        except Exception as e:
+            logger.warning("Job %s (%s) failed: %r", job_id, job.kind, e)
+            values = {"status": JOB_FAILED, "error": str(e) or repr(e)}
+
+        # Only while the job is still this claim's: once requeued, the new run records the outcome.
+        async with session_scope() as session:
+            result = await session.execute(
+                update(Job)
+                .where(and_(Job.id == job_id, Job.status == JOB_RUNNING, Job.started_at == job.started_at))
+                .values(finished_at=utcnow(), **values)
+            )
+            await session.commit()
+        if result.rowcount != 1:
+            logger.warning("Job %s (%s) was requeued while running; its outcome is dropped", job_id, job.kind)
+
+job_runner = JobRunner(JOB_WORKERS)
\ No newline at end of file
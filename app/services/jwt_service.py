@@ -1,14 +1,146 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi import HTTPException, Header, Cookie
-from ..core.config import SECRET_KEY, ALGORITHM, REFRESH_SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from ..core.config import SECRET_KEY, ALGORITHM, REFRESH_SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, TOKEN_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["bcrypt"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens whose signature has already been checked, keyed by
+    the SHA-256 of the token so raw tokens are never kept. Each entry expires
+    at the token's own `exp`, so a cache hit is never more permissive than
+    jwt.decode would be.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: dict):
+        expires_at = claims.get("exp")
+        if self.max_size <= 0 or expires_at is None:
+            return
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        with self._lock:
+            self._entries.pop(self.key(token), None)
+
+    def invalidate_subject(self, subject: str):
+        with self._lock:
+            for key in [key for key, (_, claims) in self._entries.items() if claims.get("sub") == subject]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+token_cache = VerifiedTokenCache(TOKEN_CACHE_SIZE)
+
+# Revocation hooks: each check receives the verified claims and returns True
+# when the token must be rejected. They run on cache hits as well as misses.
+revocation_checks: list[Callable[[dict], bool]] = []
+
+def register_revocation_check(check: Callable[[dict], bool]):
+    revocation_checks.append(check)
+
+class RevokedTokens:
+    """
+    Denylist of revoked tokens, keyed by the SHA-256 of their claims: signing
+    is deterministic, so equal claims mean the same token. Entries are kept
+    until the token's own `exp`, after which jwt.decode rejects it anyway.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(claims: dict) -> str:
+        return hashlib.sha256(json.dumps(claims, sort_keys=True, default=str).encode()).hexdigest()
+
+    def add(self, claims: dict):
+        now = time.time()
+        with self._lock:
+            for key in [key for key, expires_at in self._entries.items() if expires_at <= now]:
+                del self._entries[key]
+            self._entries[self.key(claims)] = float(claims.get("exp", now))
+
+    def __contains__(self, claims: dict) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(self.key(claims))
+        return expires_at is not None and expires_at > time.time()
+
+    def __len__(self):
+        return len(self._entries)
+
+revoked_tokens = RevokedTokens()
+register_revocation_check(lambda claims: claims in revoked_tokens)
+
+def revoke_token(token: str):
+    """Rejects `token` in this process until it expires. Tokens that no longer verify are already rejected."""
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return
+    revoked_tokens.add(claims)
+    token_cache.invalidate(token)
+
+def is_revoked(claims: dict) -> bool:
+    return any(check(claims) for check in revocation_checks)
+
+def verify_access_token(access_token: str) -> dict:
+    claims = token_cache.get(access_token)
+    if claims is None:
+        claims = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.put(access_token, claims)
+        logger.debug("Verified token %s for %s", token_cache.key(access_token)[:12], claims.get("sub"))
+
+    if is_revoked(claims):
+        token_cache.invalidate(access_token)
+        raise JWTError("Token revoked")
+
+    return claims
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + (timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -27,14 +159,11 @@ async def token_verifier(
 ):
     if authorization:
         try:
-            print(authorization)
             authorization = authorization.split(" ")
             if len(authorization) != 2:
                 raise JWTError
             access_token = authorization[1]
-            print("access token: ", access_token)
-            decoded_data = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
-            return decoded_data
+            return verify_access_token(access_token)
         except JWTError:
             '''
             if refresh_token:
@@ -0,0 +1,84 @@
+from dataclasses import dataclass, field
+from datetime import date as Date
+from typing import Iterable
+
+import orjson
+
+# One byte per cell of the grid, which is also how cells are sent.
+PRESENT = ord("1")
+ABSENT = ord("0")
+NOT_RECORDED = ord(".")
+
+@dataclass
+class MatrixRow:
+    student_id: int
+    student_name: str
+    cells: bytearray = field(default_factory=bytearray)
+
+def streaks(cells: bytes) -> tuple[int, int]:
+    """
+    (current, longest) runs of classes attended. Classes without a record for
+    the student, e.g. before they joined, neither extend nor break a run.
+    """
+    runs = cells.replace(b".", b"").split(b"0")
+    return len(runs[-1]), max(map(len, runs))
+
+@dataclass
+class AttendanceMatrix:
+    dates: list[Date]
+    students: list[MatrixRow]
+    present_by_date: list[int]
+    recorded_by_date: list[int]
+
+def attendance_matrix(rows: Iterable) -> AttendanceMatrix:
+    """
+    Packs (student_id, student_name, date, present) rows ordered by student
+    into one byte row per student with a column per class date.
+    """
+    rows = list(rows)
+    dates = sorted({row[2] for row in rows})
+    columns = {date: index for index, date in enumerate(dates)}
+    matrix = AttendanceMatrix(dates, [], [0] * len(dates), [0] * len(dates))
+
+    for student_id, student_name, date, present in rows:
+        if not matrix.students or matrix.students[-1].student_id != student_id:
+            matrix.students.append(MatrixRow(student_id, student_name, bytearray(b".") * len(dates)))
+        column = columns[date]
+        matrix.students[-1].cells[column] = PRESENT if present else ABSENT
+        matrix.present_by_date[column] += bool(present)
+        matrix.recorded_by_date[column] += 1
+    return matrix
+
+def attendance_matrix_json(instructor_id: int, start: Date, end: Date, rows: Iterable) -> bytes:
+    """
+    Encodes the grid with each student's cells as a string of `1` (present),
+    `0` (absent) and `.` (no record), aligned with `dates`, plus attendance
+    rates per student and per date and each student's streaks.
+    """
+    matrix = attendance_matrix(rows)
+
+    students = []
+    for student in matrix.students:
+        cells = bytes(student.cells)
+        present = cells.count(b"1")
+        recorded = len(cells) - cells.count(b".")
+        current_streak, longest_streak = streaks(cells)
+        students.append({
+            "student_id": student.student_id,
+            "student_name": student.student_name,
+            "cells": cells.decode(),
+            "present": present,
+            "recorded": recorded,
+            "rate": present / recorded,
+            "current_streak": current_streak,
+            "longest_streak": longest_streak,
+        })
+
+    return orjson.dumps({
+        "instructor_id": instructor_id,
+        "start": start,
+        "end": end,
+        "dates": matrix.dates,
+        "date_rates": [present / recorded for present, recorded in zip(matrix.present_by_date, matrix.recorded_by_date)],
+        "students": students,
+    }, option=orjson.OPT_UTC_Z)
\ No newline at end of file
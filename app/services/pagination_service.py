@@ -0,0 +1,38 @@
+import base64
+import json
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+
+from ..core.database import session_scope, stream_partitions
+from .serialization_service import rows_to_json
+
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque keyset cursor: the id of the last row of the previous page."""
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode()
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def stream_json_array(statement, fields: Sequence[str], replica: Optional[int] = None):
+    """
+    Writes the rows of `statement` as a JSON array of objects keyed by
+    `fields` while they come off a server-side cursor. Opens its own session
+    because the response body is produced after the handler and its
+    dependencies have returned; `replica` keeps it on the request's database.
+    """
+    yield b"["
+    first = True
+    async with session_scope(replica) as session:
+        async for partition in stream_partitions(session, statement, STREAM_BATCH_SIZE):
+            chunk = rows_to_json(partition, fields)[1:-1]
+            yield chunk if first else b"," + chunk
+            first = False
+    yield b"]"
\ No newline at end of file
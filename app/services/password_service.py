@@ -1,9 +1,46 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"])
+from ..core.config import BCRYPT_ROUNDS, PASSWORD_WORKERS, PASSWORD_QUEUE_LIMIT
+
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS)
+
+# bcrypt releases the GIL, so a small dedicated thread pool keeps hashing off
+# the threadpool that serves the rest of the requests. The semaphore bounds
+# running plus queued work; past that, callers get PasswordPoolBusy at once.
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="bcrypt")
+password_slots = threading.BoundedSemaphore(PASSWORD_WORKERS + PASSWORD_QUEUE_LIMIT)
+
+class PasswordPoolBusy(Exception):
+    pass
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Returns whether the password matches and, when the stored hash uses a
+    different bcrypt cost than BCRYPT_ROUNDS, a new hash to store.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def run_in_password_pool(function, *args):
+    if not password_slots.acquire(blocking=False):
+        raise PasswordPoolBusy()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_executor, function, *args)
+    finally:
+        password_slots.release()
+
+async def hash_password_async(password: str) -> str:
+    return await run_in_password_pool(hash_password, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return await run_in_password_pool(verify_and_update_password, plain_password, hashed_password)
\ No newline at end of file
@@ -0,0 +1,70 @@
+from collections import defaultdict
+from datetime import date as Date
+from typing import Iterable
+
+from sqlalchemy import Integer, cast, delete, func, insert, literal
+from sqlmodel import and_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.attendance import Attendance, AttendanceMonthly
+
+def month_bounds(year: int, month: int) -> tuple[Date, Date]:
+    start = Date(year, month, 1)
+    end = Date(year + 1, 1, 1) if month == 12 else Date(year, month + 1, 1)
+    return start, end
+
+def rollup_keys(rows: Iterable) -> set[tuple[int, int, int]]:
+    """(student_id, year, month) buckets touched by attendance-like rows."""
+    return {(row.student_id, row.date.year, row.date.month) for row in rows}
+
+async def refresh_attendance_rollups(session: AsyncSession, keys: set[tuple[int, int, int]]):
+    """
+    Recomputes the AttendanceMonthly buckets in `keys` from Attendance inside
+    the caller's transaction. Each bucket is a month of one student, so the
+    cost is bounded by the size of the write, not by the attendance history.
+    Pending ORM changes are flushed first so the recount sees them.
+    """
+    if not keys:
+        return
+
+    await session.flush()
+
+    students_by_month = defaultdict(set)
+    for student_id, year, month in keys:
+        students_by_month[(year, month)].add(student_id)
+
+    for (year, month), student_ids in students_by_month.items():
+        start, end = month_bounds(year, month)
+
+        await session.execute(
+            delete(AttendanceMonthly).where(
+                and_(
+                    AttendanceMonthly.student_id.in_(student_ids),
+                    AttendanceMonthly.year == year,
+                    AttendanceMonthly.month == month
+                )
+            )
+        )
+
+        counts = (
+            select(
+                Attendance.student_id,
+                literal(year),
+                literal(month),
+                func.sum(cast(Attendance.present, Integer)),
+                func.count()
+            )
+            .where(
+                and_(
+                    Attendance.student_id.in_(student_ids),
+                    Attendance.date >= start,
+                    Attendance.date < end
+                )
+            )
+            .group_by(Attendance.student_id)
+        )
+        await session.execute(
+            insert(AttendanceMonthly).from_select(
+                ["student_id", "year", "month", "present_count", "total_count"], counts
+            )
+        )
\ No newline at end of file
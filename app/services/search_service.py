@@ -0,0 +1,241 @@
+import heapq
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Iterable
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import SEARCH_INDEX_MAX_INSTRUCTORS, SEARCH_INDEX_TTL, SEARCH_SIMILARITY
+from ..core.database import session_scope
+from ..models.student import Student
+
+# Scores: a whole-token match ranks above a prefix match, which ranks above
+# any typo-tolerant match (trigram similarity, at most 1, is scaled by this).
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.9
+FUZZY_WEIGHT = 0.8
+FUZZY_MIN_LENGTH = 3
+
+def normalize(text: str) -> str:
+    """Lowercase without accents, keeping letters, digits, '@' and spaces: `12.345.678-K` becomes `12345678k`."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in text if char.isalnum() or char.isspace() or char == "@")
+
+def trigrams(token: str) -> set[str]:
+    """Trigrams of a word padded like pg_trgm does, so `ab` yields `  a`, ` ab` and `ab `."""
+    padded = f"  {token} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+def name_tokens(name: str) -> set[str]:
+    return set(normalize(name).split())
+
+def contact_tokens(email: str, rut: str) -> set[str]:
+    email = normalize(email).replace(" ", "")
+    return {email, email.split("@")[0], normalize(rut).replace(" ", "")} - {""}
+
+@dataclass
+class SearchHit:
+    id: int
+    name: str
+    email: str
+    rut: str
+    score: float
+
+class StudentSearchIndex:
+    """
+    Token index over the name, email and RUT of one instructor's students.
+    Prefixes are found by bisecting the sorted token list. Typos are matched
+    by counting shared trigrams with the words of names only: emails and RUTs
+    are unique per student and are matched by prefix.
+    """
+
+    def __init__(self, rows=()):
+        self.students: dict[int, tuple[str, str, str, set[str], set[str]]] = {}
+        self.ids_by_token: dict[str, set[int]] = defaultdict(set)
+        self.name_token_counts: dict[str, int] = defaultdict(int)
+        self.tokens_by_trigram: dict[str, set[str]] = defaultdict(set)
+        self.trigram_counts: dict[str, int] = {}
+        self.sorted_tokens: list[str] = []
+        for row in rows:
+            self._add(*row, keep_sorted=False)
+        self.sorted_tokens.sort()
+
+    def add(self, student_id: int, name: str, email: str, rut: str):
+        self.discard(student_id)
+        self._add(student_id, name, email, rut, keep_sorted=True)
+
+    def _add(self, student_id: int, name: str, email: str, rut: str, keep_sorted: bool):
+        names = name_tokens(name)
+        tokens = names | contact_tokens(email, rut)
+        self.students[student_id] = (name, email, rut, tokens, names)
+        for token in tokens:
+            if token not in self.ids_by_token:
+                if keep_sorted:
+                    insort(self.sorted_tokens, token)
+                else:
+                    self.sorted_tokens.append(token)
+            self.ids_by_token[token].add(student_id)
+        for token in names:
+            self.name_token_counts[token] += 1
+            if self.name_token_counts[token] == 1:
+                grams = trigrams(token)
+                self.trigram_counts[token] = len(grams)
+                for gram in grams:
+                    self.tokens_by_trigram[gram].add(token)
+
+    def discard(self, student_id: int):
+        entry = self.students.pop(student_id, None)
+        if entry is None:
+            return
+        tokens, names = entry[3], entry[4]
+        for token in tokens:
+            ids = self.ids_by_token[token]
+            ids.discard(student_id)
+            if not ids:
+                del self.ids_by_token[token]
+                del self.sorted_tokens[bisect_left(self.sorted_tokens, token)]
+        for token in names:
+            self.name_token_counts[token] -= 1
+            if self.name_token_counts[token]:
+                continue
+            del self.name_token_counts[token]
+            del self.trigram_counts[token]
+            for gram in trigrams(token):
+                grams = self.tokens_by_trigram[gram]
+                grams.discard(token)
+                if not grams:
+                    del self.tokens_by_trigram[gram]
+
+    def word_scores(self, word: str) -> dict[int, float]:
+        """Best score of every student with a token matching `word`."""
+        token_scores = {}
+
+        index = bisect_left(self.sorted_tokens, word)
+        while index < len(self.sorted_tokens) and self.sorted_tokens[index].startswith(word):
+            token = self.sorted_tokens[index]
+            token_scores[token] = EXACT_SCORE if token == word else PREFIX_SCORE
+            index += 1
+
+        if len(word) >= FUZZY_MIN_LENGTH:
+            word_grams = trigrams(word)
+            shared = defaultdict(int)
+            for gram in word_grams:
+                for token in self.tokens_by_trigram.get(gram, ()):
+                    shared[token] += 1
+            for token, count in shared.items():
+                similarity = count / (len(word_grams) + self.trigram_counts[token] - count)
+                if similarity >= SEARCH_SIMILARITY and token not in token_scores:
+                    token_scores[token] = similarity * FUZZY_WEIGHT
+
+        # Lowest first, so a student's best token is the one written last.
+        scores = {}
+        for token, score in sorted(token_scores.items(), key=itemgetter(1)):
+            scores.update(dict.fromkeys(self.ids_by_token[token], score))
+        return scores
+
+    def search(self, query: str, limit: int) -> list[SearchHit]:
+        """
+        Students matching every word of `query`, best first. A student's score
+        is the mean over the query words of its best matching token.
+        """
+        words = normalize(query).split()
+        if not words:
+            return []
+
+        scores = None
+        for word in words:
+            word_scores = self.word_scores(word)
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {student_id: score + word_scores[student_id] for student_id, score in scores.items() if student_id in word_scores}
+            if not scores:
+                return []
+
+        # Scores take few distinct values, so rank band by band and only sort
+        # the bands that reach into the first `limit` results by name.
+        best = []
+        for band in sorted(set(scores.values()), reverse=True):
+            ids = [student_id for student_id, score in scores.items() if score == band]
+            best.extend((student_id, band) for student_id in heapq.nsmallest(limit - len(best), ids, key=self.sort_key))
+            if len(best) >= limit:
+                break
+        return [
+            SearchHit(student_id, *self.students[student_id][:3], round(score / len(words), 3))
+            for student_id, score in best
+        ]
+
+    def sort_key(self, student_id: int) -> tuple[str, int]:
+        return self.students[student_id][0], student_id
+
+class StudentSearch:
+    """
+    Per-instructor indexes built on first search and kept in a bounded LRU.
+    Writes in this worker update the index in place; other workers pick them
+    up when their copy is older than SEARCH_INDEX_TTL seconds. Indexes are
+    built from the primary, since a lagging replica could miss writes this
+    worker has already applied, and a build that overlaps a write to the same
+    instructor is used once but not kept.
+    """
+
+    def __init__(self, ttl: float, max_instructors: int):
+        self.ttl = ttl
+        self.max_instructors = max_instructors
+        self._indexes: OrderedDict[int, tuple[float, StudentSearchIndex]] = OrderedDict()
+        self._generations: defaultdict[int, int] = defaultdict(int)
+
+    async def load(self, session: AsyncSession, instructor_id: int) -> list:
+        statement = select(Student.id, Student.name, Student.email, Student.rut).where(Student.instructor_id == instructor_id)
+        if session.info.get("replica") is None:
+            return (await session.exec(statement)).all()
+        async with session_scope() as primary:
+            return (await primary.exec(statement)).all()
+
+    async def index(self, session: AsyncSession, instructor_id: int) -> StudentSearchIndex:
+        item = self._indexes.get(instructor_id)
+        if item is not None and item[0] > time.monotonic():
+            self._indexes.move_to_end(instructor_id)
+            return item[1]
+
+        generation = self._generations[instructor_id]
+        expires_at = time.monotonic() + self.ttl
+        index = StudentSearchIndex(await self.load(session, instructor_id))
+        if self._generations[instructor_id] != generation:
+            return index
+
+        self._indexes[instructor_id] = (expires_at, index)
+        self._indexes.move_to_end(instructor_id)
+        while len(self._indexes) > self.max_instructors:
+            self._indexes.popitem(last=False)
+        return index
+
+    async def search(self, session: AsyncSession, instructor_id: int, query: str, limit: int) -> list[SearchHit]:
+        return (await self.index(session, instructor_id)).search(query, limit)
+
+    def add(self, student: Student):
+        """Indexes a created or updated student if its instructor's index is loaded."""
+        self._generations[student.instructor_id] += 1
+        item = self._indexes.get(student.instructor_id)
+        if item is not None:
+            item[1].add(student.id, student.name, student.email, student.rut)
+
+    def add_rows(self, rows: Iterable[tuple[int, int, str, str, str]]):
+        """Like `add` for (instructor_id, id, name, email, rut) rows, so bulk writes need not build Student objects."""
+        for instructor_id, student_id, name, email, rut in rows:
+            self._generations[instructor_id] += 1
+            item = self._indexes.get(instructor_id)
+            if item is not None:
+                item[1].add(student_id, name, email, rut)
+
+    def discard(self, instructor_id: int, student_id: int):
+        self._generations[instructor_id] += 1
+        item = self._indexes.get(instructor_id)
+        if item is not None:
+            item[1].discard(student_id)
+
+student_search = StudentSearch(SEARCH_INDEX_TTL, SEARCH_INDEX_MAX_INSTRUCTORS)
\ No newline at end of file
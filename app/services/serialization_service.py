@@ -0,0 +1,29 @@
+from typing import Iterable, Sequence
+
+import orjson
+from fastapi import Response
+from sqlmodel import SQLModel
+
+class JSONBytesResponse(Response):
+    """Response for bodies that are already encoded JSON bytes."""
+    media_type = "application/json"
+
+def schema_fields(schema: type[SQLModel]) -> tuple[str, ...]:
+    """Field names of `schema` in declaration order, which is the order the queries select them in."""
+    return tuple(schema.model_fields)
+
+def schema_columns(model: type[SQLModel], schema: type[SQLModel] = None) -> list:
+    """Table columns of `model` matching the fields of `schema` (the model itself by default)."""
+    return [model.__table__.c[name] for name in schema_fields(schema or model)]
+
+def rows_to_json(rows: Iterable[Sequence], fields: Sequence[str]) -> bytes:
+    """
+    Encodes row tuples as a JSON array of objects keyed by `fields`, without
+    building model instances or going through response_model validation.
+    The rows must come from a query that selects the schema's columns in order.
+    """
+    return orjson.dumps([dict(zip(fields, row)) for row in rows], option=orjson.OPT_UTC_Z)
+
+def values_to_json(values: Iterable) -> bytes:
+    """Encodes a flat list of scalars (ids, dates) as a JSON array."""
+    return orjson.dumps(list(values))
\ No newline at end of file
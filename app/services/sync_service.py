@@ -0,0 +1,183 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import insert, literal
+from sqlmodel import and_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.database import dialect_insert
+from ..models.attendance import Attendance
+from ..models.student import Student, StudentProgress
+from ..models.sync import SYNC_ATTENDANCE, SYNC_PROGRESS, SYNC_STUDENT, SyncClock, SyncTombstone
+from .serialization_service import schema_columns, schema_fields
+
+# Version of rows written before their transaction took its clocks. They are
+# restamped with stamp_rows() before commit, so it is never visible.
+UNSTAMPED_VERSION = 0
+STAMP_BATCH_SIZE = 1000
+
+# Synced entities in the order they are sent: the model of their rows and
+# the key they are listed under in the response and in `deleted`.
+SYNCED_MODELS = {
+    SYNC_STUDENT: (Student, "students"),
+    SYNC_ATTENDANCE: (Attendance, "attendance"),
+    SYNC_PROGRESS: (StudentProgress, "progress"),
+}
+
+def encode_sync_token(instructor_id: int, version: int) -> str:
+    """Opaque token handed to the client: the instructor's clock value its data is current to."""
+    return base64.urlsafe_b64encode(json.dumps({"instructor_id": instructor_id, "version": version}).encode()).decode()
+
+def decode_sync_token(token: str, instructor_id: int) -> int:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode()))
+        token_instructor_id, version = data["instructor_id"], int(data["version"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    # Versions count per instructor, so a token only makes sense for its own.
+    if token_instructor_id != instructor_id:
+        raise HTTPException(status_code=400, detail="Sync token was issued for another instructor")
+    return version
+
+async def student_instructors(session: AsyncSession, student_ids: Iterable[int]) -> dict[int, int]:
+    """Instructor of each student, whose clock versions the student's attendance and progress."""
+    student_ids = set(student_ids)
+    if not student_ids:
+        return {}
+    return dict((await session.exec(select(Student.id, Student.instructor_id).where(Student.id.in_(student_ids)))).all())
+
+async def next_sync_version(session: AsyncSession, instructor_ids: Iterable[int]) -> int:
+    """
+    Advances the clocks of `instructor_ids` inside the caller's transaction
+    and returns the version to stamp its writes with. The clock rows stay
+    locked until commit, so each instructor's versions are committed in
+    increasing order and their clock is the high-water mark a delta sync can
+    resume from; writes for other instructors are not held up. Run it before
+    the transaction's first write to a synced table, with every instructor
+    it touches: clocks are locked in instructor order, so concurrent writers
+    cannot deadlock on them. A transaction spanning several instructors moves
+    their clocks to one common version.
+    """
+    instructor_ids = sorted(set(instructor_ids))
+    if not instructor_ids:
+        return 0
+
+    statement = dialect_insert(SyncClock).values([{"instructor_id": instructor_id, "version": 1} for instructor_id in instructor_ids])
+    statement = statement.on_conflict_do_update(
+        index_elements=[SyncClock.instructor_id], set_={"version": SyncClock.version + 1}
+    ).returning(SyncClock.version)
+    versions = (await session.execute(statement)).scalars().all()
+    version = max(versions)
+    if min(versions) < version:
+        await session.execute(update(SyncClock).where(SyncClock.instructor_id.in_(instructor_ids)).values(version=version))
+    return version
+
+async def next_student_sync_version(session: AsyncSession, student_ids: Iterable[int]) -> int:
+    """next_sync_version() for writes to the attendance or progress of `student_ids`."""
+    return await next_sync_version(session, (await student_instructors(session, student_ids)).values())
+
+def sync_stamp(version: int) -> dict:
+    """`version` and `updated_at` values for the rows a write touches."""
+    return {"version": version, "updated_at": datetime.now(timezone.utc)}
+
+async def stamp_rows(session: AsyncSession, model, ids: list[int], version: int):
+    """
+    Stamps rows of `model` that were written with UNSTAMPED_VERSION, so a
+    long write can take its clocks only once it is about to commit.
+    """
+    stamp = sync_stamp(version)
+    for start in range(0, len(ids), STAMP_BATCH_SIZE):
+        await session.execute(update(model).where(model.id.in_(ids[start:start + STAMP_BATCH_SIZE])).values(**stamp))
+
+async def add_tombstones(session: AsyncSession, version: int, entity: str, rows: Iterable[tuple[int, int]]):
+    """Records (instructor_id, entity_id) rows that left the instructor's scope."""
+    deleted_at = datetime.now(timezone.utc)
+    tombstones = [
+        {"instructor_id": instructor_id, "entity": entity, "entity_id": entity_id, "version": version, "deleted_at": deleted_at}
+        for instructor_id, entity_id in rows
+    ]
+    if tombstones:
+        await session.execute(insert(SyncTombstone), tombstones)
+
+async def tombstone_attendance(session: AsyncSession, condition):
+    """
+    Takes the clocks of the instructors whose students have attendance
+    matching `condition`, then tombstones it for them with one INSERT ...
+    SELECT. Run it before deleting the rows; nothing matching, nothing taken.
+    """
+    in_scope = select(Student.instructor_id).join(Attendance, Attendance.student_id == Student.id).where(condition)
+    instructor_ids = (await session.exec(in_scope.distinct())).all()
+    if not instructor_ids:
+        return
+    version = await next_sync_version(session, instructor_ids)
+    await session.execute(insert(SyncTombstone).from_select(
+        ["instructor_id", "entity", "entity_id", "version", "deleted_at"],
+        select(Student.instructor_id, literal(SYNC_ATTENDANCE), Attendance.id, literal(version), literal(datetime.now(timezone.utc), SyncTombstone.deleted_at.type))
+        .join(Student, Attendance.student_id == Student.id)
+        .where(condition)
+    ))
+
+async def tombstone_reassigned(session: AsyncSession, version: int, entity: str, moves: dict[int, tuple[int, int]], instructors: dict[int, int]):
+    """
+    Attendance and progress follow their student's instructor. `moves` maps
+    entity ids whose student changed to (previous student_id, new student_id)
+    and `instructors` is student_instructors() of both; the previous
+    instructor gets a tombstone when the instructor changed.
+    """
+    await add_tombstones(session, version, entity, [
+        (instructors[previous], entity_id)
+        for entity_id, (previous, current) in moves.items()
+        if previous in instructors and instructors[previous] != instructors.get(current)
+    ])
+
+async def move_student(session: AsyncSession, version: int, student_id: int, previous_instructor_id: int):
+    """
+    A student changed instructor: the previous one gets a tombstone, and the
+    student's attendance and progress are restamped so the new one receives them.
+    """
+    await add_tombstones(session, version, SYNC_STUDENT, [(previous_instructor_id, student_id)])
+    for model in (Attendance, StudentProgress):
+        await session.execute(update(model).where(model.student_id == student_id).values(**sync_stamp(version)))
+
+def changed_rows_statement(entity: str, instructor_id: int, since: Optional[int]):
+    model, _ = SYNCED_MODELS[entity]
+    statement = select(*schema_columns(model))
+    if model is Student:
+        statement = statement.where(Student.instructor_id == instructor_id)
+    else:
+        statement = statement.join(Student, model.student_id == Student.id).where(Student.instructor_id == instructor_id)
+    if since is not None:
+        statement = statement.where(model.version > since)
+    return statement.order_by(model.id)
+
+async def changes_since(session: AsyncSession, instructor_id: int, since: Optional[int]) -> bytes:
+    """
+    The instructor's students, attendance and progress written after version
+    `since`, and the tombstones recorded after it; everything in scope when
+    `since` is None. The clock is read first: rows committed while the
+    response is built carry a later version, so the next sync sends them
+    again rather than missing them.
+    """
+    current = (await session.exec(select(SyncClock.version).where(SyncClock.instructor_id == instructor_id))).first() or 0
+
+    changes = {"token": encode_sync_token(instructor_id, current)}
+    for entity, (model, key) in SYNCED_MODELS.items():
+        rows = (await session.exec(changed_rows_statement(entity, instructor_id, since))).all()
+        fields = schema_fields(model)
+        changes[key] = [dict(zip(fields, row)) for row in rows]
+
+    deleted = {entity: [] for entity in SYNCED_MODELS}
+    if since is not None:
+        tombstones = (await session.exec(
+            select(SyncTombstone.entity, SyncTombstone.entity_id, SyncTombstone.version)
+            .where(and_(SyncTombstone.instructor_id == instructor_id, SyncTombstone.version > since))
+            .order_by(SyncTombstone.version, SyncTombstone.id)
+        )).all()
+        for entity, entity_id, version in tombstones:
+            deleted[entity].append({"id": entity_id, "version": version})
+    changes["deleted"] = {SYNCED_MODELS[entity][1]: rows for entity, rows in deleted.items()}
+    return orjson.dumps(changes, option=orjson.OPT_UTC_Z)
\ No newline at end of file
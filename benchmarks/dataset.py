@@ -0,0 +1,148 @@
+"""
+Fills the database at DATABASE_URL with a synthetic dataset for the route
+benchmarks:
+
+    python -m benchmarks.dataset --instructors 20 --students 30 --days 90 --progress 12 --reset
+
+Every instructor gets `--students` students, each student one attendance per
+day for `--days` days ending at `--end-date` and `--progress` progress entries
+spread over the same period. Instructors log in with the password
+`--password`. The output is deterministic for a given `--seed`. The schema
+is brought to the head revision with Alembic before inserting.
+"""
+import argparse
+import random
+import time
+from datetime import date as Date, timedelta
+
+from sqlalchemy import Integer, MetaData, Table, cast, extract, func, insert
+from sqlmodel import SQLModel, select
+
+from app.core.database import engine
+from app.core.schema_version import upgrade_schema
+from app.models import job, sync  # noqa: F401 - dropped with the other tables on --reset
+from app.models.attendance import Attendance, AttendanceMonthly
+from app.models.student import Student, StudentProgress
+from app.models.user import User
+from app.services.password_service import hash_password
+
+INSERT_BATCH_SIZE = 5000
+
+def insert_returning_ids(connection, model, rows: list[dict]) -> list[int]:
+    statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+    ids = []
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        ids.extend(connection.execute(statement, rows[start:start + INSERT_BATCH_SIZE]).scalars())
+    return ids
+
+def insert_batches(connection, model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            connection.execute(insert(model), batch)
+            batch = []
+    if batch:
+        connection.execute(insert(model), batch)
+
+def rebuild_attendance_rollups(connection):
+    year = cast(extract("year", Attendance.date), Integer)
+    month = cast(extract("month", Attendance.date), Integer)
+    counts = (
+        select(Attendance.student_id, year, month, func.sum(cast(Attendance.present, Integer)), func.count())
+        .group_by(Attendance.student_id, year, month)
+    )
+    connection.execute(AttendanceMonthly.__table__.delete())
+    connection.execute(
+        insert(AttendanceMonthly).from_select(["student_id", "year", "month", "present_count", "total_count"], counts)
+    )
+
+def generate(args) -> dict:
+    rng = random.Random(args.seed)
+    days = [args.end_date - timedelta(days=offset) for offset in reversed(range(args.days))]
+    progress_days = days[::max(1, len(days) // max(1, args.progress))][:args.progress]
+    password = hash_password(args.password)
+
+    with engine.begin() as connection:
+        instructor_ids = insert_returning_ids(connection, User, [
+            {
+                "email": f"instructor{number}@sportview.cl",
+                "password": password,
+                "first_name": "Instructor",
+                "last_name": str(number),
+            }
+            for number in range(1, args.instructors + 1)
+        ])
+
+        student_rows = []
+        for instructor_id in instructor_ids:
+            for _ in range(args.students):
+                number = len(student_rows) + 1
+                student_rows.append({
+                    "instructor_id": instructor_id,
+                    "name": f"Student {number}",
+                    "email": f"student{number}@sportview.cl",
+                    "rut": f"{10000000 + number}-{number % 10}",
+                    "sex": rng.choice(["F", "M"]),
+                    "age": rng.randint(8, 60),
+                    "weight": round(rng.uniform(25, 110), 1),
+                    "height": round(rng.uniform(1.2, 2.0), 2),
+                })
+        student_ids = insert_returning_ids(connection, Student, student_rows)
+
+        insert_batches(connection, Attendance, (
+            {
+                "instructor_id": student["instructor_id"],
+                "student_id": student_id,
+                "date": day,
+                "present": rng.random() < args.presence,
+            }
+            for student_id, student in zip(student_ids, student_rows)
+            for day in days
+        ))
+        rebuild_attendance_rollups(connection)
+
+        insert_batches(connection, StudentProgress, (
+            {
+                "student_id": student_id,
+                "progress_date": day,
+                "technique": rng.randint(1, 10),
+                "physique": rng.randint(1, 10),
+                "combat_iq": rng.randint(1, 10),
+            }
+            for student_id in student_ids
+            for day in progress_days
+        ))
+
+    return {
+        "instructors": len(instructor_ids),
+        "students": len(student_ids),
+        "attendances": len(student_ids) * len(days),
+        "progress": len(student_ids) * len(progress_days),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic SportView dataset.")
+    parser.add_argument("--instructors", type=int, default=20)
+    parser.add_argument("--students", type=int, default=30, help="students per instructor")
+    parser.add_argument("--days", type=int, default=90, help="attendance days per student")
+    parser.add_argument("--progress", type=int, default=12, help="progress entries per student")
+    parser.add_argument("--presence", type=float, default=0.85, help="probability of being present")
+    parser.add_argument("--end-date", type=Date.fromisoformat, default=Date(2024, 6, 30))
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="drop every table and migrate from scratch first")
+    args = parser.parse_args()
+
+    if args.reset:
+        SQLModel.metadata.drop_all(engine)
+        Table("alembic_version", MetaData()).drop(engine, checkfirst=True)
+    upgrade_schema()
+
+    start = time.perf_counter()
+    counts = generate(args)
+    summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+    print(f"Inserted {summary} into {engine.url.render_as_string()} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
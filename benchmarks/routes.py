@@ -0,0 +1,473 @@
+"""
+Drives every route of the API in-process through the ASGI app and reports
+throughput, latency percentiles and SQL queries per request:
+
+    python -m benchmarks.dataset --reset
+    python -m benchmarks.routes --requests 100 --concurrency 10 --save benchmarks/baseline.json
+    python -m benchmarks.routes --compare benchmarks/baseline.json --tolerance 0.5
+
+Runs against the database at DATABASE_URL, which should hold a dataset from
+benchmarks.dataset. Write scenarios only touch rows they create themselves,
+dated after the last attendance in the database, so the harness can be run
+repeatedly; regenerate the dataset before recording a baseline.
+
+With --compare the exit status is 1 when a route issues more queries per
+request than the baseline, fails where it used to succeed, or its median
+latency grows by more than --tolerance. Latencies are only comparable between
+runs on the same machine, dataset and database backend; query counts are
+comparable everywhere.
+"""
+import argparse
+import asyncio
+import contextvars
+import inspect
+import json
+import platform
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date as Date, timedelta
+from typing import Callable, Optional
+
+import httpx
+from sqlalchemy import event, func, insert
+from sqlmodel import Session, select
+
+from app.core.database import async_engine, engine
+from app.main import app
+from app.models.attendance import Attendance
+from app.models.student import Student, StudentProgress
+from app.models.sync import SyncClock
+from app.models.user import User
+from app.services.job_service import job_runner
+from app.services.jwt_service import create_access_token
+from app.services.sync_service import encode_sync_token
+
+# Queries issued by the request running in the current task. The harness sets
+# a fresh counter per request; engine events (including those fired on the
+# threadpool, which copies the context) add to it.
+query_counter: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("query_counter", default=None)
+
+def count_query(*args):
+    counter = query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+def instrument_engines():
+    for sync_engine in filter(None, [engine, async_engine and async_engine.sync_engine]):
+        event.listen(sync_engine, "before_cursor_execute", count_query)
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # Builds (path, json body, raw content) for the i-th request.
+    build: Callable[[int], tuple]
+    requests: Optional[int] = None
+    # Receives each successful response, e.g. to collect ids for later scenarios.
+    collect: Optional[Callable[[int, httpx.Response], None]] = None
+    concurrency: Optional[int] = None
+    # Called with the request count before the scenario runs, to create the rows it consumes. May be async.
+    prepare: Optional[Callable[[int], None]] = None
+
+@dataclass
+class Result:
+    route: str
+    requests: int = 0
+    errors: int = 0
+    latencies: list = field(default_factory=list)
+    queries: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000 if ordered else 0.0
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput": round(self.requests / self.elapsed, 1) if self.elapsed else 0.0,
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 2) if ordered else 0.0,
+            "p50_ms": round(percentile(0.50), 2),
+            "p95_ms": round(percentile(0.95), 2),
+            "p99_ms": round(percentile(0.99), 2),
+            "queries_per_request": round(self.queries / self.requests, 2) if self.requests else 0.0,
+        }
+
+class Fixtures:
+    """
+    Ids picked from the dataset for read scenarios, plus the rows created by
+    write scenarios so that update and delete scenarios have targets.
+    """
+
+    def __init__(self, sample_size: int):
+        with Session(engine) as session:
+            self.instructors = session.exec(
+                select(User.id, User.email).where(User.id.in_(select(Student.instructor_id))).order_by(User.id).limit(sample_size)
+            ).all()
+            if not self.instructors:
+                sys.exit("The database has no students; run `python -m benchmarks.dataset` first.")
+            self.students = [
+                session.exec(select(Student.id, Student.name, Student.email, Student.rut).where(Student.instructor_id == instructor.id).order_by(Student.id)).first()
+                for instructor in self.instructors
+            ]
+            self.classes = {
+                instructor.id: session.exec(select(Student.id).where(Student.instructor_id == instructor.id).order_by(Student.id).limit(30)).all()
+                for instructor in self.instructors
+            }
+            # Reads use the latest fully populated class day; writes go after the last date of any attendance.
+            self.read_date = session.exec(
+                select(Attendance.date).group_by(Attendance.date).order_by(func.count().desc(), Attendance.date.desc()).limit(1)
+            ).one()
+            self.last_date = session.exec(select(func.max(Attendance.date))).one()
+            self.attendances = session.exec(
+                select(Attendance).where(Attendance.student_id == self.students[0].id, Attendance.date == self.read_date)
+            ).all()
+            self.progress = session.exec(select(StudentProgress).where(StudentProgress.student_id == self.students[0].id)).all()
+            # Delta syncs start here and receive what the write scenarios change.
+            clocks = dict(session.exec(select(SyncClock.instructor_id, SyncClock.version)).all())
+            self.sync_tokens = {instructor.id: encode_sync_token(instructor.id, clocks.get(instructor.id, 0)) for instructor in self.instructors}
+
+        self.run_id = uuid.uuid4().hex[:8]
+        self.created_students = []
+        self.created_attendances = []
+        self.bulk_students = []
+        self.created_jobs = []
+
+    def instructor(self, i: int):
+        return self.instructors[i % len(self.instructors)]
+
+    def student(self, i: int):
+        return self.students[i % len(self.students)]
+
+    def new_date(self, i: int):
+        return (self.last_date + timedelta(days=i + 1)).isoformat()
+
+    def attendance_class(self, instructor_id: int, day: str) -> list[dict]:
+        return [
+            {"instructor_id": instructor_id, "student_id": student_id, "date": day, "present": True}
+            for student_id in self.classes[instructor_id]
+        ]
+
+    def insert_rows(self, model, rows: list[dict]) -> list[int]:
+        with engine.begin() as connection:
+            return list(connection.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows).scalars())
+
+    def insert_bulk_students(self, count: int):
+        self.bulk_students = self.insert_rows(Student, [
+            {
+                "instructor_id": self.instructor(i).id, "name": f"Bulk {self.run_id} {i}", "email": f"bulk-{self.run_id}-{i}@sportview.cl",
+                "rut": f"bulk-{self.run_id}-{i}", "sex": "M", "age": 30, "weight": 70.0, "height": 1.7,
+            }
+            for i in range(count)
+        ])
+
+    def insert_classes(self, count: int, first_day: int):
+        self.insert_rows(Attendance, [
+            {**row, "date": Date.fromisoformat(row["date"])}
+            for i in range(count)
+            for row in self.attendance_class(self.instructor(i).id, self.new_date(first_day + i))
+        ])
+
+    async def run_jobs(self, count: int):
+        """Runs submitted jobs inline, since the app's job workers only start with its lifespan."""
+        for job_id in self.created_jobs[:count]:
+            await job_runner.run(job_id)
+
+def build_scenarios(fixtures: Fixtures, password: str, password_requests: int) -> list[Scenario]:
+    f = fixtures
+    read_date = f.read_date.isoformat()
+    month = f.read_date.month
+
+    def new_student(i: int) -> dict:
+        return {
+            "instructor_id": f.instructor(i).id, "name": f"Benchmark {f.run_id} {i}", "email": f"benchmark-{f.run_id}-{i}@sportview.cl",
+            "rut": f"{f.run_id}-{i}", "sex": "F", "age": 30, "weight": 70.0, "height": 1.7,
+        }
+
+    # Day offsets after the last attendance, kept apart per write scenario.
+    ndjson_days, range_delete_days, session_days = 10_000, 20_000, 30_000
+    bulk_delete_size = 10
+    import_size = 100
+
+    def import_batch(i: int) -> list[dict]:
+        return [
+            {**new_student(i), "name": f"Import {f.run_id} {i} {n}", "email": f"import-{f.run_id}-{i}-{n}@sportview.cl", "rut": f"import-{f.run_id}-{i}-{n}"}
+            for n in range(import_size)
+        ]
+
+    def class_session(i: int) -> dict:
+        instructor_id = f.instructor(i).id
+        return {"instructor_id": instructor_id, "date": f.new_date(session_days + i), "students": [
+            {"student_id": student_id, "present": True, "technique": 5, "physique": 5, "combat_iq": 5} for student_id in f.classes[instructor_id]
+        ]}
+
+    def ndjson_class(i: int) -> bytes:
+        day = f.new_date(ndjson_days + i)
+        return "\n".join(json.dumps(row) for row in f.attendance_class(f.instructor(i).id, day)).encode()
+
+    return [
+        Scenario("GET /", "GET", lambda i: ("/", None, None)),
+        Scenario("GET /api/v1/health/pool", "GET", lambda i: ("/api/v1/health/pool", None, None)),
+        Scenario("GET /metrics", "GET", lambda i: ("/metrics", None, None)),
+
+        Scenario("POST /api/v1/users/", "POST", lambda i: ("/api/v1/users/", {
+            "email": f"benchmark-{f.run_id}-{i}@sportview.cl", "password": password, "first_name": "Benchmark", "last_name": str(i)
+        }, None), requests=password_requests),
+        Scenario("POST /api/v1/users/login/", "POST", lambda i: ("/api/v1/users/login/", {
+            "email": f.instructor(i).email, "password": password
+        }, None), requests=password_requests),
+        Scenario("GET /api/v1/users/id/{user_id}", "GET", lambda i: (f"/api/v1/users/id/{f.instructor(i).id}", None, None)),
+        Scenario("GET /api/v1/users/email/{user_email}", "GET", lambda i: (f"/api/v1/users/email/{f.instructor(i).email}", None, None)),
+        Scenario("GET /api/v1/users/verify-token/", "GET", lambda i: ("/api/v1/users/verify-token/", None, None)),
+
+        Scenario("POST /api/v1/students/", "POST", lambda i: ("/api/v1/students/", new_student(i), None),
+                 collect=lambda i, response: f.created_students.append(response.json()["id"])),
+        Scenario("POST /api/v1/students/import", "POST", lambda i: ("/api/v1/students/import", import_batch(i), None)),
+        Scenario("GET /api/v1/students/id/{student_id}", "GET", lambda i: (f"/api/v1/students/id/{f.student(i).id}", None, None)),
+        Scenario("GET /api/v1/students/{instructor_id}", "GET", lambda i: (f"/api/v1/students/{f.instructor(i).id}", None, None)),
+        Scenario("GET /api/v1/students/{instructor_id}?limit=20", "GET", lambda i: (f"/api/v1/students/{f.instructor(i).id}?limit=20", None, None)),
+        Scenario("GET /api/v1/students/{instructor_id}?stream=true", "GET", lambda i: (f"/api/v1/students/{f.instructor(i).id}?stream=true", None, None)),
+        Scenario("GET /api/v1/students/email/{student_email}", "GET", lambda i: (f"/api/v1/students/email/{f.student(i).email}", None, None)),
+        Scenario("GET /api/v1/students/rut/{student_rut}", "GET", lambda i: (f"/api/v1/students/rut/{f.student(i).rut}", None, None)),
+        Scenario("GET /api/v1/students/search/{instructor_id}", "GET", lambda i: (
+            f"/api/v1/students/search/{f.instructor(i).id}?q={f.student(i).name[:-1].lower()}", None, None
+        )),
+        Scenario("GET /api/v1/students/dashboard/{instructor_id}", "GET", lambda i: (
+            f"/api/v1/students/dashboard/{f.instructor(i).id}?as_of={read_date}", None, None
+        )),
+        Scenario("PUT /api/v1/students/edit/id/{student_id}", "PUT", lambda i: (
+            f"/api/v1/students/edit/id/{f.created_students[i % len(f.created_students)]}", {"weight": 70.0 + i % 10}, None
+        ), concurrency=1),
+        Scenario("POST /api/v1/students/progress/", "POST", lambda i: ("/api/v1/students/progress/", {
+            "student_id": f.student(i).id, "progress_date": read_date, "technique": 5, "physique": 5, "combat_iq": 5
+        }, None)),
+        Scenario("GET /api/v1/students/progress/student/{student_id}/{date}", "GET", lambda i: (
+            f"/api/v1/students/progress/student/{f.progress[0].student_id}/{f.progress[0].progress_date}", None, None
+        )),
+        Scenario("GET /api/v1/students/progress/student-avg/{student_id}/{month}", "GET", lambda i: (
+            f"/api/v1/students/progress/student-avg/{f.student(i).id}/{month if i % 2 else 0}", None, None
+        )),
+        Scenario("GET /api/v1/students/progress/instructor-avg/{instructor_id}/{month}", "GET", lambda i: (
+            f"/api/v1/students/progress/instructor-avg/{f.instructor(i).id}/{month}", None, None
+        )),
+        Scenario("PUT /api/v1/students/progress/{student_progress_id}", "PUT", lambda i: (
+            f"/api/v1/students/progress/{f.progress[i % len(f.progress)].id}", {"technique": 1 + i % 10}, None
+        ), concurrency=1),
+        Scenario("GET /api/v1/students/progress/dates/{instructor_id}/{student_id}", "GET", lambda i: (
+            f"/api/v1/students/progress/dates/{f.instructor(i).id}/{f.student(i).id}", None, None
+        )),
+
+        Scenario("POST /api/v1/attendance/", "POST", lambda i: (
+            "/api/v1/attendance/", f.attendance_class(f.instructor(i).id, f.new_date(i)), None
+        ), collect=lambda i, response: f.created_attendances.extend(response.json()["ids"])),
+        Scenario("POST /api/v1/attendance/ndjson", "POST", lambda i: ("/api/v1/attendance/ndjson", None, ndjson_class(i))),
+        Scenario("POST /api/v1/attendance/session", "POST", lambda i: ("/api/v1/attendance/session", class_session(i), None)),
+        Scenario("GET /api/v1/attendance/all/{instructor_id}/{date}", "GET", lambda i: (
+            f"/api/v1/attendance/all/{f.instructor(i).id}/{read_date}", None, None
+        )),
+        Scenario("GET /api/v1/attendance/all/{instructor_id}/{date}?stream=true", "GET", lambda i: (
+            f"/api/v1/attendance/all/{f.instructor(i).id}/{read_date}?stream=true", None, None
+        )),
+        Scenario("GET /api/v1/attendance/matrix/{instructor_id}", "GET", lambda i: (
+            f"/api/v1/attendance/matrix/{f.instructor(i).id}?start={f.read_date - timedelta(days=365)}&end={f.read_date}", None, None
+        )),
+        Scenario("PUT /api/v1/attendance/", "PUT", lambda i: ("/api/v1/attendance/", [
+            {**attendance.model_dump(mode="json"), "present": bool(i % 2)} for attendance in f.attendances
+        ], None), concurrency=1),
+        Scenario("PUT /api/v1/attendance/upsert", "PUT", lambda i: (
+            "/api/v1/attendance/upsert", f.attendance_class(f.instructor(i).id, read_date), None
+        ), concurrency=1),
+        Scenario("GET /api/v1/attendance/dates/{instructor_id}", "GET", lambda i: (f"/api/v1/attendance/dates/{f.instructor(i).id}", None, None)),
+        Scenario("GET /api/v1/attendance/avg/{student_id}/{month}", "GET", lambda i: (
+            f"/api/v1/attendance/avg/{f.student(i).id}/{month}", None, None
+        )),
+        Scenario("GET /api/v1/attendance/avg/{student_id}/{year}/{month}", "GET", lambda i: (
+            f"/api/v1/attendance/avg/{f.student(i).id}/{f.read_date.year}/{month}", None, None
+        )),
+        Scenario("GET /api/v1/attendance/instructor-avg/{instructor_id}/{month}", "GET", lambda i: (
+            f"/api/v1/attendance/instructor-avg/{f.instructor(i).id}/{month}", None, None
+        )),
+        Scenario("GET /api/v1/attendance/instructor-avg/{instructor_id}/{year}/{month}", "GET", lambda i: (
+            f"/api/v1/attendance/instructor-avg/{f.instructor(i).id}/{f.read_date.year}/{month}", None, None
+        )),
+
+        Scenario("GET /api/v1/exports/attendance/{instructor_id}", "GET", lambda i: (
+            f"/api/v1/exports/attendance/{f.instructor(i).id}?start={f.read_date - timedelta(days=365)}&end={f.read_date}", None, None
+        )),
+        Scenario("GET /api/v1/exports/progress/{instructor_id}", "GET", lambda i: (
+            f"/api/v1/exports/progress/{f.instructor(i).id}?start={f.read_date - timedelta(days=365)}&end={f.read_date}", None, None
+        )),
+
+        Scenario("POST /api/v1/jobs/", "POST", lambda i: ("/api/v1/jobs/", {"kind": "instructor_report", "params": {
+            "instructor_id": f.instructor(i).id, "start": (f.read_date - timedelta(days=i + 1)).isoformat(), "end": read_date
+        }}, None), collect=lambda i, response: f.created_jobs.append(response.json()["id"])),
+        Scenario("GET /api/v1/jobs/{job_id}", "GET", lambda i: (f"/api/v1/jobs/{f.created_jobs[i % len(f.created_jobs)]}", None, None)),
+        Scenario("GET /api/v1/jobs/{job_id}/result", "GET", lambda i: (
+            f"/api/v1/jobs/{f.created_jobs[i % len(f.created_jobs)]}/result", None, None
+        ), prepare=f.run_jobs),
+
+        Scenario("GET /api/v1/sync/{instructor_id}", "GET", lambda i: (f"/api/v1/sync/{f.instructor(i).id}", None, None)),
+        Scenario("GET /api/v1/sync/{instructor_id}?since=token", "GET", lambda i: (
+            f"/api/v1/sync/{f.instructor(i).id}?since={f.sync_tokens[f.instructor(i).id]}", None, None
+        )),
+
+        Scenario("DELETE /api/v1/attendance/{attendance_id}", "DELETE", lambda i: (
+            f"/api/v1/attendance/{f.created_attendances[i]}", None, None
+        )),
+        Scenario("DELETE /api/v1/attendance/instructor/{instructor_id}", "DELETE", lambda i: (
+            f"/api/v1/attendance/instructor/{f.instructor(i).id}?start={f.new_date(range_delete_days + i)}&end={f.new_date(range_delete_days + i)}", None, None
+        ), prepare=lambda requests: f.insert_classes(requests, range_delete_days)),
+
+        Scenario("DELETE /api/v1/students/delete/id/{student_id}", "DELETE", lambda i: (
+            f"/api/v1/students/delete/id/{f.created_students[i]}", None, None
+        )),
+        Scenario("POST /api/v1/students/delete/bulk", "POST", lambda i: ("/api/v1/students/delete/bulk", {
+            "student_ids": f.bulk_students[i * bulk_delete_size:(i + 1) * bulk_delete_size]
+        }, None), prepare=lambda requests: f.insert_bulk_students(requests * bulk_delete_size)),
+    ]
+
+def route_templates() -> list[tuple]:
+    """(methods, template) of every documented route, router prefixes included."""
+    return [({method.upper() for method in operations}, path) for path, operations in app.openapi()["paths"].items()]
+
+def uncovered_routes(scenarios: list[Scenario]) -> list[str]:
+    covered = {scenario.name.split("?")[0] for scenario in scenarios}
+    return [
+        f"{method} {template}"
+        for methods, template in route_templates()
+        for method in sorted(methods)
+        if f"{method} {template}" not in covered
+    ]
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> Result:
+    result = Result(scenario.name)
+    indexes = iter(range(requests))
+
+    async def worker():
+        for i in indexes:
+            path, body, content = scenario.build(i)
+            counter = [0]
+            token = query_counter.set(counter)
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, path, json=body, content=content)
+            finally:
+                query_counter.reset(token)
+            result.latencies.append(time.perf_counter() - start)
+            result.requests += 1
+            result.queries += counter[0]
+            if response.is_success:
+                if scenario.collect:
+                    scenario.collect(i, response)
+            else:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+async def run(args) -> dict:
+    fixtures = Fixtures(args.sample)
+    scenarios = build_scenarios(fixtures, args.password, args.password_requests)
+    for route in uncovered_routes(scenarios):
+        print(f"warning: no scenario for {route}", file=sys.stderr)
+
+    only = [name.lower() for name in args.only]
+    token = create_access_token({"sub": fixtures.instructors[0].email})
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers={"Authorization": f"Bearer {token}"}) as client:
+        for scenario in scenarios:
+            if only and not any(name in scenario.name.lower() for name in only):
+                continue
+            requests = min(scenario.requests or args.requests, args.requests)
+            concurrency = scenario.concurrency or args.concurrency
+            if scenario.prepare:
+                prepared = scenario.prepare(requests)
+                if inspect.isawaitable(prepared):
+                    await prepared
+            # Warm-up request, not measured (first-use costs such as statement compilation).
+            if args.warmup and scenario.method == "GET":
+                path, body, content = scenario.build(0)
+                await client.request(scenario.method, path, json=body, content=content)
+            result = await run_scenario(client, scenario, requests, concurrency)
+            results[scenario.name] = result.summary()
+            print(format_row(scenario.name, results[scenario.name]))
+    return results
+
+HEADER = f"{'route':<72}{'req':>5}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}"
+
+def format_row(name: str, summary: dict) -> str:
+    return (
+        f"{name:<72}{summary['requests']:>5}{summary['errors']:>5}{summary['throughput']:>9.1f}"
+        f"{summary['p50_ms']:>9.2f}{summary['p95_ms']:>9.2f}{summary['p99_ms']:>9.2f}{summary['queries_per_request']:>9.2f}"
+    )
+
+# Updates that write an unchanged value skip the UPDATE, so the average can
+# move by a fraction of a query between runs without any code change.
+QUERY_SLACK = 0.1
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, expected in baseline["routes"].items():
+        actual = results.get(name)
+        if actual is None:
+            continue
+        if actual["queries_per_request"] > expected["queries_per_request"] + QUERY_SLACK:
+            regressions.append(f"{name}: {expected['queries_per_request']} -> {actual['queries_per_request']} queries per request")
+        if actual["errors"] and not expected["errors"]:
+            regressions.append(f"{name}: {actual['errors']} failed requests")
+        if expected["p50_ms"] and actual["p50_ms"] > expected["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {expected['p50_ms']} ms -> {actual['p50_ms']} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every API route in-process.")
+    parser.add_argument("--requests", type=int, default=100, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--password-requests", type=int, default=10, help="requests for the bcrypt-bound user routes")
+    parser.add_argument("--password", default="benchmark", help="password of the dataset instructors")
+    parser.add_argument("--sample", type=int, default=10, help="instructors the read scenarios rotate over")
+    parser.add_argument("--only", nargs="*", default=[], help="run only routes containing one of these strings")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative p50 growth with --compare")
+    args = parser.parse_args()
+
+    instrument_engines()
+    print(HEADER)
+    results = asyncio.run(run(args))
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({
+                "environment": {
+                    "dialect": engine.dialect.name,
+                    "python": platform.python_version(),
+                    "requests": args.requests,
+                    "concurrency": args.concurrency,
+                },
+                "routes": results,
+            }, file, indent=2)
+            file.write("\n")
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Compares the fast-path list serialization with the response_model path at
+100, 1k and 10k rows:
+
+    python -m benchmarks.serialization --repeat 5
+
+Both paths query an in-memory SQLite database, so the numbers include the
+query. The response_model path is what the routes did before: fetch ORM
+objects or rows, validate them against the schema, encode with jsonable
+rules and json.dumps. The fast path selects the schema's columns and
+encodes the row tuples with orjson.
+"""
+import argparse
+import json
+import time
+from datetime import date, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models.attendance import Attendance
+from app.models.student import Student
+from app.models.user import User
+from app.schemas.attendance import AttendanceResponse
+from app.services.serialization_service import rows_to_json, schema_columns, schema_fields
+
+SIZES = (100, 1_000, 10_000)
+
+def build_database(rows: int):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, email="instructor@sportview.cl", password="x", first_name="Instructor", last_name=None))
+        session.add_all(
+            Student(id=i, instructor_id=1, name=f"Student {i}", email=f"student{i}@sportview.cl", rut=f"{i}-K", sex="F", age=20, weight=60.5, height=1.7)
+            for i in range(1, rows + 1)
+        )
+        session.add_all(
+            Attendance(instructor_id=1, student_id=i, date=date(2024, 3, 1) + timedelta(days=i // 1000), present=i % 3 != 0)
+            for i in range(1, rows + 1)
+        )
+        session.commit()
+    return engine
+
+def attendance_statement():
+    return select(
+        Attendance.id, Attendance.instructor_id, Attendance.student_id,
+        Student.name.label("student_name"), Attendance.date, Attendance.present
+    ).join(Student, Attendance.student_id == Student.id).where(Attendance.instructor_id == 1)
+
+def response_model_path(adapter: TypeAdapter, items) -> bytes:
+    validated = adapter.validate_python(items, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+def best_of(repeat: int, run) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list serialization paths.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    students_adapter = TypeAdapter(list[Student])
+    attendance_adapter = TypeAdapter(list[AttendanceResponse])
+    student_fields = schema_fields(Student)
+    attendance_fields = schema_fields(AttendanceResponse)
+
+    print(f"{'endpoint':<18}{'rows':>8}{'response_model ms':>20}{'fast path ms':>15}{'speedup':>10}")
+    for rows in SIZES:
+        engine = build_database(rows)
+        with Session(engine) as session:
+            cases = {
+                "read_students": (
+                    lambda: response_model_path(students_adapter, session.exec(select(Student)).all()),
+                    lambda: rows_to_json(session.exec(select(*schema_columns(Student))).all(), student_fields),
+                ),
+                "get_attendances": (
+                    lambda: response_model_path(attendance_adapter, [row._mapping for row in session.exec(attendance_statement()).all()]),
+                    lambda: rows_to_json(session.exec(attendance_statement()).all(), attendance_fields),
+                ),
+            }
+            for name, (slow, fast) in cases.items():
+                assert json.loads(slow()) == json.loads(fast()), f"{name} outputs differ"
+                slow_time = best_of(args.repeat, slow)
+                fast_time = best_of(args.repeat, fast)
+                print(f"{name:<18}{rows:>8}{slow_time * 1000:>20.2f}{fast_time * 1000:>15.2f}{slow_time / fast_time:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
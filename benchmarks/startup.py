@@ -0,0 +1,117 @@
+"""
+Cold-start budget check: how long a fresh worker takes to import the app, run
+its startup hooks and answer a first request:
+
+    python -m benchmarks.startup --runs 5 --import-budget-ms 1500 --first-request-budget-ms 500
+
+Each run is a new interpreter. The median of the runs is compared with the
+budgets and the exit status is 1 when one is exceeded. The repository has no
+test suite, so this is a script rather than a pytest test: nothing runs it
+unless a CI step does, where it fails a change that adds an eager import or
+connects to the database at import time.
+`--top` lists the slowest app modules from `python -X importtime`.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = r"""
+import asyncio, json, sys, time
+
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+import httpx
+
+async def lifespan_startup(asgi_app):
+    messages = asyncio.Queue()
+    await messages.put({"type": "lifespan.startup"})
+    started = asyncio.get_running_loop().create_future()
+
+    async def send(message):
+        if not started.done():
+            started.set_result(message)
+
+    task = asyncio.create_task(asgi_app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, messages.get, send))
+    message = await started
+    if message["type"] != "lifespan.startup.complete":
+        sys.exit(f"startup failed: {message.get('message')}")
+    return task
+
+async def main():
+    before_startup = time.perf_counter()
+    lifespan = await lifespan_startup(app.main.app)
+    started = time.perf_counter()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app.main.app), base_url="http://startup") as client:
+        response = await client.get(sys.argv[1])
+    answered = time.perf_counter()
+    lifespan.cancel()
+
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "startup_ms": (started - before_startup) * 1000,
+        "first_request_ms": (answered - started) * 1000,
+        "status": response.status_code,
+    }))
+
+asyncio.run(main())
+"""
+
+def run_child(path: str) -> dict:
+    process = subprocess.run(
+        [sys.executable, "-c", CHILD, path], capture_output=True, text=True, env={**os.environ, "PYTHONWARNINGS": "ignore"}
+    )
+    if process.returncode != 0:
+        sys.exit(process.stderr.strip().splitlines()[-1])
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def slowest_app_modules(count: int) -> list[tuple[int, str]]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and name.strip().startswith("app"):
+            modules.append((int(cumulative), name.rstrip()))
+    return sorted(modules, reverse=True)[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure and budget the cold start of a worker.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/v1/students/1", help="route answered as the first request")
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--first-request-budget-ms", type=float, default=500)
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest app modules to import")
+    args = parser.parse_args()
+
+    runs = [run_child(args.path) for _ in range(args.runs)]
+    medians = {key: statistics.median(run[key] for run in runs) for key in ("import_ms", "startup_ms", "first_request_ms")}
+    for key, value in medians.items():
+        print(f"{key:<20}{value:10.1f}")
+    print(f"{'first status':<20}{runs[-1]['status']:>10}")
+
+    if args.top:
+        print()
+        for cumulative, name in slowest_app_modules(args.top):
+            print(f"{cumulative / 1000:10.1f} ms {name}")
+
+    failures = []
+    if medians["import_ms"] > args.import_budget_ms:
+        failures.append(f"import took {medians['import_ms']:.0f} ms, budget {args.import_budget_ms:.0f} ms")
+    if medians["first_request_ms"] > args.first_request_budget_ms:
+        failures.append(f"first request took {medians['first_request_ms']:.0f} ms, budget {args.first_request_budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Microbenchmark of the per-request auth cost in token_verifier:
+
+    python -m benchmarks.token_verifier --iterations 20000
+
+Compares a full jwt.decode (signature + claims check) against a hit in the
+verified-token cache, and reports the time each adds to a request.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("REFRESH_SECRET_KEY", "benchmark-refresh-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+
+from app.services.jwt_service import create_access_token, token_cache, token_verifier
+
+def measure(label: str, iterations: int, run) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        run()
+    per_call = (time.perf_counter() - start) / iterations
+    print(f"{label:<28} {per_call * 1e6:10.2f} us/request")
+    return per_call
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark token_verifier with and without the token cache.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    header = f"Bearer {create_access_token({'sub': 'benchmark@sportview.cl'})}"
+    loop = asyncio.new_event_loop()
+
+    def uncached():
+        token_cache.clear()
+        loop.run_until_complete(token_verifier(header))
+
+    def cached():
+        loop.run_until_complete(token_verifier(header))
+
+    def clear_only():
+        token_cache.clear()
+
+    baseline = measure("cache clear (overhead)", args.iterations, clear_only)
+    miss = measure("jwt.decode (cache miss)", args.iterations, uncached) - baseline
+    hit = measure("cache hit", args.iterations, cached)
+    print(f"{'saved per request':<28} {(miss - hit) * 1e6:10.2f} us ({miss / hit:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""initial schema
+
+Tables and indexes as created by SQLModel.metadata.create_all before
+migrations were introduced. Databases created that way should be stamped
+with `alembic stamp 0001` before running `alembic upgrade head`.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 10:06:40.432964
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('password', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('first_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('last_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_email'), 'user', ['email'], unique=False)
+    op.create_table('student',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('instructor_id', sa.Integer(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('rut', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('sex', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=True),
+    sa.Column('height', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['instructor_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_student_email'), 'student', ['email'], unique=False)
+    op.create_index(op.f('ix_student_rut'), 'student', ['rut'], unique=False)
+    op.create_table('attendance',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('instructor_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('present', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['instructor_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['student.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attendance_date'), 'attendance', ['date'], unique=False)
+    op.create_table('studentprogress',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('progress_date', sa.Date(), nullable=False),
+    sa.Column('technique', sa.Integer(), nullable=True),
+    sa.Column('physique', sa.Integer(), nullable=True),
+    sa.Column('combat_iq', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['student.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('studentprogress')
+    op.drop_index(op.f('ix_attendance_date'), table_name='attendance')
+    op.drop_table('attendance')
+    op.drop_index(op.f('ix_student_rut'), table_name='student')
+    op.drop_index(op.f('ix_student_email'), table_name='student')
+    op.drop_table('student')
+    op.drop_index(op.f('ix_user_email'), table_name='user')
+    op.drop_table('user')
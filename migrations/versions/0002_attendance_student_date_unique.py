@@ -0,0 +1,39 @@
+"""attendance (student_id, date) unique constraint
+
+Required by the attendance upsert. Duplicate (student_id, date) rows left
+by the old insert path are deleted first, keeping the latest (highest id)
+of each pair.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:12:03.118412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    attendance = sa.table('attendance', sa.column('id', sa.Integer), sa.column('student_id', sa.Integer), sa.column('date', sa.Date))
+    latest = sa.select(sa.func.max(attendance.c.id)).group_by(attendance.c.student_id, attendance.c.date)
+    op.execute(attendance.delete().where(attendance.c.id.not_in(latest)))
+
+    with op.batch_alter_table('attendance') as batch_op:
+        batch_op.create_unique_constraint('uq_attendance_student_date', ['student_id', 'date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('attendance') as batch_op:
+        batch_op.drop_constraint('uq_attendance_student_date', type_='unique')
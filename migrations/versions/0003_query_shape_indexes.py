@@ -0,0 +1,43 @@
+"""composite indexes for the hot query shapes
+
+- attendance (instructor_id, date) INCLUDE (student_id, present):
+  get_attendances and get_dates.
+- student (instructor_id): read_students and the student.instructor_id
+  foreign key.
+- studentprogress (student_id, progress_date): get_progress_dates,
+  read_student_progress and read_student_progress_average.
+
+Attendance lookups by (student_id, date) are served by the unique
+constraint added in 0002.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:15:47.502231
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_attendance_instructor_id_date', 'attendance', ['instructor_id', 'date'], unique=False, postgresql_include=['student_id', 'present'])
+    op.create_index(op.f('ix_student_instructor_id'), 'student', ['instructor_id'], unique=False)
+    op.create_index('ix_studentprogress_student_id_progress_date', 'studentprogress', ['student_id', 'progress_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_studentprogress_student_id_progress_date', table_name='studentprogress')
+    op.drop_index(op.f('ix_student_instructor_id'), table_name='student')
+    op.drop_index('ix_attendance_instructor_id_date', table_name='attendance')
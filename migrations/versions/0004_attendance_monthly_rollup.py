@@ -0,0 +1,60 @@
+"""attendance monthly rollup
+
+Adds the per-student (year, month) present/total counts read by the
+attendance average endpoints, and backfills them from existing attendance.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:41:12.730954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    attendancemonthly = op.create_table('attendancemonthly',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('present_count', sa.Integer(), nullable=False),
+    sa.Column('total_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['student_id'], ['student.id'], ),
+    sa.PrimaryKeyConstraint('student_id', 'year', 'month')
+    )
+
+    attendance = sa.table('attendance',
+        sa.column('student_id', sa.Integer()),
+        sa.column('date', sa.Date()),
+        sa.column('present', sa.Boolean()),
+    )
+    year = sa.cast(sa.extract('year', attendance.c.date), sa.Integer())
+    month = sa.cast(sa.extract('month', attendance.c.date), sa.Integer())
+    op.execute(
+        attendancemonthly.insert().from_select(
+            ['student_id', 'year', 'month', 'present_count', 'total_count'],
+            sa.select(
+                attendance.c.student_id,
+                year,
+                month,
+                sa.func.sum(sa.cast(attendance.c.present, sa.Integer())),
+                sa.func.count(),
+            ).group_by(attendance.c.student_id, year, month)
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('attendancemonthly')
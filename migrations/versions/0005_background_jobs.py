@@ -0,0 +1,51 @@
+"""background jobs
+
+Durable table behind the background job runner. The partial unique index
+on key keeps one pending or running job per kind and parameters, and
+(key, finished_at) finds a recent finished result to reuse.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 10:50:39.733356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('params', sa.Text(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False),
+    sa.Column('started_at', sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True),
+    sa.Column('finished_at', sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_key_finished_at', 'job', ['key', 'finished_at'], unique=False)
+    op.create_index('ix_job_status', 'job', ['status'], unique=False)
+    op.create_index('uq_job_key_active', 'job', ['key'], unique=True, postgresql_where=sa.text("status IN ('pending', 'running')"), sqlite_where=sa.text("status IN ('pending', 'running')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_job_key_active', table_name='job', postgresql_where=sa.text("status IN ('pending', 'running')"), sqlite_where=sa.text("status IN ('pending', 'running')"))
+    op.drop_index('ix_job_status', table_name='job')
+    op.drop_index('ix_job_key_finished_at', table_name='job')
+    op.drop_table('job')
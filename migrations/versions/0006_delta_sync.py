@@ -0,0 +1,74 @@
+"""delta sync
+
+Adds version and updated_at to student, attendance and studentprogress,
+with the (owner, version) indexes the sync endpoint reads through, the
+per-instructor sync clocks the versions come from and the tombstone table.
+Existing rows get version 0, so they are sent by a first sync only.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 11:02:17.406235
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = {
+    'student': ('ix_student_instructor_id_version', ['instructor_id', 'version']),
+    'attendance': ('ix_attendance_student_id_version', ['student_id', 'version']),
+    'studentprogress': ('ix_studentprogress_student_id_version', ['student_id', 'version']),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (index, columns) in SYNCED_TABLES.items():
+        # SQLite cannot add a column with a CURRENT_TIMESTAMP default, so
+        # updated_at is added empty, backfilled, then given its default.
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+            batch_op.add_column(sa.Column('updated_at', sqlmodel.sql.sqltypes.UTCDateTime(), nullable=True))
+        op.execute(sa.table(table, sa.column('updated_at')).update().values(updated_at=sa.func.current_timestamp()))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False, server_default=sa.func.current_timestamp())
+            batch_op.create_index(index, columns, unique=False)
+
+    # Clock rows are created by an instructor's first synced write.
+    op.create_table('syncclock',
+    sa.Column('instructor_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('instructor_id')
+    )
+
+    op.create_table('synctombstone',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('instructor_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sqlmodel.sql.sqltypes.UTCDateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_synctombstone_instructor_id_version', 'synctombstone', ['instructor_id', 'version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_synctombstone_instructor_id_version', table_name='synctombstone')
+    op.drop_table('synctombstone')
+    op.drop_table('syncclock')
+    for table, (index, columns) in SYNCED_TABLES.items():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(index)
+            batch_op.drop_column('updated_at')
+            batch_op.drop_column('version')
@@ -0,0 +1,56 @@
+"""
+Prints the EXPLAIN plan of the query behind each hot route, so index usage
+can be checked after running the migrations:
+
+    python -m scripts.explain_queries --instructor-id 1 --student-id 1 --date 2024-03-01
+
+On small development tables the planner prefers sequential scans; pass
+--no-seqscan (PostgreSQL only) to see which index it would pick.
+"""
+import argparse
+from datetime import date as Date
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.routes.attendance import attendance_avg_statement, attendance_dates_statement, attendances_on_date_statement
+from app.routes.students import progress_dates_statement, roster_statement
+
+def route_queries(instructor_id: int, student_id: int, date: Date, month: int) -> dict:
+    """The statements the routes run, built by the same functions."""
+    return {
+        "attendance.get_attendances": attendances_on_date_statement(instructor_id, date),
+        "attendance.get_dates": attendance_dates_statement(instructor_id),
+        "attendance.get_avg_attendance_by_year": attendance_avg_statement(student_id, month, date.year),
+        "students.read_students": roster_statement(instructor_id),
+        "students.get_progress_dates": progress_dates_statement(instructor_id, student_id),
+    }
+
+def explain(statement) -> list[str]:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN" if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"{prefix} {compiled}")).all()
+    return [" | ".join(str(value) for value in row) for row in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description="Print EXPLAIN plans for the route queries.")
+    parser.add_argument("--instructor-id", type=int, default=1)
+    parser.add_argument("--student-id", type=int, default=1)
+    parser.add_argument("--date", type=Date.fromisoformat, default=Date.today())
+    parser.add_argument("--month", type=int, default=Date.today().month)
+    parser.add_argument("--no-seqscan", action="store_true", help="SET enable_seqscan = off (PostgreSQL)")
+    args = parser.parse_args()
+
+    if args.no_seqscan and engine.dialect.name == "postgresql":
+        from sqlalchemy import event
+        event.listen(engine, "connect", lambda dbapi_connection, _: dbapi_connection.cursor().execute("SET enable_seqscan = off"))
+
+    for name, statement in route_queries(args.instructor_id, args.student_id, args.date, args.month).items():
+        print(f"== {name}")
+        for line in explain(statement):
+            print(f"   {line}")
+        print()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file